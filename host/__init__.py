@@ -0,0 +1,14 @@
+from .clock import SimulationComplete, VirtualClock
+from .devices import ScriptedPin, SimulatedHC_SR04, ST7032Display, Trace
+from .simulator import Simulation, Transition
+
+__all__ = [
+    "ScriptedPin",
+    "SimulatedHC_SR04",
+    "Simulation",
+    "SimulationComplete",
+    "ST7032Display",
+    "Trace",
+    "Transition",
+    "VirtualClock",
+]
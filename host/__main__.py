@@ -0,0 +1,60 @@
+import argparse
+import time
+
+from .devices import Trace
+from .simulator import Simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate a target loitering in front of the alarm."
+    )
+    parser.add_argument("--arrive", type=float, default=10, help="seconds")
+    parser.add_argument("--leave", type=float, default=400, help="seconds")
+    parser.add_argument("--distance", type=float, default=100, help="cm")
+    parser.add_argument(
+        "--background", type=float, default=160, help="cm, echo with no target"
+    )
+    parser.add_argument("--duration", type=float, default=480, help="seconds")
+    parser.add_argument("--alert-after", type=int, default=5 * 60, help="seconds")
+    args = parser.parse_args()
+
+    with Simulation() as simulation:
+        simulation.add_sensor(
+            Trace.visit(
+                arrive_s=args.arrive,
+                leave_s=args.leave,
+                distance_cm=args.distance,
+                background_cm=args.background,
+            )
+        )
+        display = simulation.add_display()
+
+        from loitering_alarm import LoiteringAlarm
+        from loitering_monitor import LoiteringMonitor
+
+        from lib import AE_AQM0802, HC_SR04, Buzzer
+
+        monitor = LoiteringMonitor(alert_after_seconds=args.alert_after)
+        alarm = LoiteringAlarm(
+            distance_sensor=HC_SR04(trigger_pin=14, echo_pin=15),
+            display=AE_AQM0802(clock_pin=17, data_pin=16),
+            buzzer=Buzzer(pin_number=13, is_active=False),
+            monitor=monitor,
+        )
+
+        started = time.perf_counter()
+        simulation.run(alarm.run, args.duration, monitor=monitor)
+        elapsed = time.perf_counter() - started
+
+    print(simulation.format_timeline())
+    print("Display:", *display.lines, sep="\n  ")
+    print(
+        f"Simulated {args.duration:.0f} s in {elapsed:.2f} s "
+        f"({args.duration / elapsed:.0f}x real time), "
+        f"{simulation.world.i2c_transactions} I2C transactions"
+    )
+
+
+if __name__ == "__main__":
+    main()
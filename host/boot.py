@@ -0,0 +1,76 @@
+import argparse
+import sys
+from collections import namedtuple
+
+from .devices import Trace
+from .simulator import SOURCE_DIR, Simulation, unload_firmware
+
+BootTiming = namedtuple("BootTiming", ["first_sample_ms", "first_frame_ms", "modules"])
+
+
+def _firmware_modules() -> list[str]:
+    return sorted(
+        name
+        for name, module in sys.modules.items()
+        if (getattr(module, "__file__", None) or "").startswith(str(SOURCE_DIR))
+    )
+
+
+def _since(start_us: int, at_us: int | None) -> float | None:
+    return None if at_us is None else (at_us - start_us) / 1000
+
+
+def measure_boot(*, defer_init: bool, duration_s: float = 5.0) -> BootTiming:
+    # Virtual milliseconds from power-on to the first ping and to the first
+    # character on the display, booting the way main.py does from a cold
+    # import, as after a reset.
+    unload_firmware()
+    with Simulation() as simulation:
+        sensor = simulation.add_sensor(Trace([(0, 100)]))
+        display = simulation.add_display()
+        started_us = simulation.clock.now_us
+
+        from loitering_alarm import LoiteringAlarm
+        from loitering_monitor import LoiteringMonitor
+
+        from lib import AE_AQM0802, HC_SR04, Buzzer
+
+        alarm = LoiteringAlarm(
+            distance_sensor=HC_SR04(trigger_pin=14, echo_pin=15),
+            display=AE_AQM0802(clock_pin=17, data_pin=16, defer_init=defer_init),
+            buzzer=Buzzer(pin_number=13, is_active=False),
+            monitor=LoiteringMonitor(),
+        )
+        simulation.run(alarm.run, duration_s)
+
+    modules = _firmware_modules()
+    unload_firmware()
+    return BootTiming(
+        _since(started_us, sensor.first_ping_us),
+        _since(started_us, display.first_data_us),
+        modules,
+    )
+
+
+def _format_ms(value: float | None) -> str:
+    return "never" if value is None else f"{value:8.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure time to the first sample and first frame after boot."
+    )
+    parser.add_argument("--duration", type=float, default=5, help="seconds")
+    args = parser.parse_args()
+
+    for label, defer_init in (("blocking init", False), ("deferred init", True)):
+        timing = measure_boot(defer_init=defer_init, duration_s=args.duration)
+        print(
+            f"{label}: first sample {_format_ms(timing.first_sample_ms)}, "
+            f"first frame {_format_ms(timing.first_frame_ms)}"
+        )
+    print("firmware modules loaded:", ", ".join(timing.modules))
+
+
+if __name__ == "__main__":
+    main()
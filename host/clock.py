@@ -0,0 +1,140 @@
+import heapq
+import threading
+
+# MicroPython's ticks_* values wrap at 2**30
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALF_PERIOD = _TICKS_PERIOD // 2
+
+
+class SimulationComplete(Exception):
+    pass
+
+
+class VirtualClock:
+    def __init__(self) -> None:
+        self.now_us = 0
+        self.end_us: int | None = None
+        self.observers: list = []
+        self._events: list = []
+        self._sequence = 0
+
+        # Threads started with start_thread take turns with the thread that
+        # started them, like two cores sharing one timeline: one runs at a
+        # time, and advancing the clock hands the turn to whichever thread
+        # is due first
+        self._turn = threading.Condition()
+        self._turn_order: list = []
+        self._holder = None
+        self._threads = 0
+        self._local = threading.local()
+
+    @property
+    def now_s(self) -> float:
+        return self.now_us / 1_000_000
+
+    def schedule(self, delay_us: int, callback) -> None:
+        heapq.heappush(
+            self._events, (self.now_us + max(0, delay_us), self._sequence, callback)
+        )
+        self._sequence += 1
+
+    def next_event_us(self) -> int | None:
+        return self._events[0][0] if self._events else None
+
+    def advance(self, duration_us: int) -> None:
+        deadline_us = self.now_us + max(0, int(duration_us))
+        token = getattr(self._local, "token", None)
+        if self._threads and token is not None:
+            with self._turn:
+                self._queue_turn(deadline_us, token)
+                self._hand_over()
+                while self._holder is not token:
+                    self._turn.wait()
+        self.run_until(lambda: False, deadline_us)
+
+    def start_thread(self, function, args: tuple = ()) -> None:
+        # The new thread first runs when the caller next advances the clock
+        token = object()
+        with self._turn:
+            if self._holder is None:
+                self._local.token = self._holder = object()
+            self._threads += 1
+            self._queue_turn(self.now_us, token)
+
+        def run() -> None:
+            self._local.token = token
+            with self._turn:
+                while self._holder is not token:
+                    self._turn.wait()
+            try:
+                function(*args)
+            finally:
+                with self._turn:
+                    self._threads -= 1
+                    self._hand_over()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _queue_turn(self, at_us: int, token) -> None:
+        heapq.heappush(self._turn_order, (at_us, self._sequence, token))
+        self._sequence += 1
+
+    def _hand_over(self) -> None:
+        if self._turn_order:
+            self._holder = heapq.heappop(self._turn_order)[2]
+            self._turn.notify_all()
+
+    def run_until(self, predicate, deadline_us: int) -> bool:
+        # Processes events until the predicate holds or the deadline passes
+        if predicate():
+            return True
+
+        while self._events and self._events[0][0] <= deadline_us:
+            at_us, _, callback = heapq.heappop(self._events)
+            self.now_us = max(self.now_us, at_us)
+            callback()
+            if predicate():
+                self._notify()
+                return True
+
+        self.now_us = max(self.now_us, deadline_us)
+        self._notify()
+        return False
+
+    def _notify(self) -> None:
+        for observer in self.observers:
+            observer(self)
+        if self.end_us is not None and self.now_us >= self.end_us:
+            raise SimulationComplete
+
+    # Stand-ins for the MicroPython time module
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds * 1_000_000)
+
+    def sleep_ms(self, ms: int) -> None:
+        self.advance(ms * 1000)
+
+    def sleep_us(self, us: int) -> None:
+        self.advance(us)
+
+    def time(self) -> float:
+        return self.now_s
+
+    def ticks_us(self) -> int:
+        return self.now_us & _TICKS_MAX
+
+    def ticks_ms(self) -> int:
+        return (self.now_us // 1000) & _TICKS_MAX
+
+    def ticks_cpu(self) -> int:
+        return self.ticks_us()
+
+    @staticmethod
+    def ticks_add(ticks: int, delta: int) -> int:
+        return (ticks + delta) & _TICKS_MAX
+
+    @staticmethod
+    def ticks_diff(end: int, start: int) -> int:
+        return ((end - start + _TICKS_HALF_PERIOD) & _TICKS_MAX) - _TICKS_HALF_PERIOD
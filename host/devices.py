@@ -0,0 +1,140 @@
+import bisect
+
+from .world import World
+
+SPEED_OF_SOUND_CM_PER_US = 0.0343
+
+
+class Trace:
+    # Piecewise-constant distance: each (time_s, distance_cm) step holds until
+    # the next one. None means nothing reflects the ping.
+    def __init__(self, steps: list[tuple[float, float | None]]) -> None:
+        if not steps:
+            raise ValueError("A trace needs at least one step")
+
+        self.steps = sorted(steps, key=lambda step: step[0])
+        self._times = [time_s for time_s, _ in self.steps]
+
+    def distance_at(self, time_s: float) -> float | None:
+        index = bisect.bisect_right(self._times, time_s) - 1
+        if index < 0:
+            return None
+        return self.steps[index][1]
+
+    @classmethod
+    def visit(
+        cls,
+        *,
+        arrive_s: float,
+        leave_s: float,
+        distance_cm: float = 100,
+        background_cm: float | None = None,
+    ) -> "Trace":
+        return cls(
+            [(0, background_cm), (arrive_s, distance_cm), (leave_s, background_cm)]
+        )
+
+
+class ScriptedPin:
+    # Drives a pin through edges at fixed offsets, for testing IRQ handlers
+    def __init__(self, world: World, pin_id) -> None:
+        self.world = world
+        self.state = world.pin(pin_id)
+
+    def script(self, edges: list[tuple[int, int]]) -> None:
+        # (microseconds from now, level) pairs
+        for delay_us, value in edges:
+            self.world.clock.schedule(
+                delay_us, lambda value=value: self.state.set(value)
+            )
+
+
+class SimulatedHC_SR04:
+    # The module raises echo roughly 450 us after the trigger falls
+    ECHO_DELAY_US = 450
+    MAX_ECHO_US = 38_000
+
+    def __init__(
+        self,
+        world: World,
+        trigger_pin: int,
+        echo_pin: int,
+        trace: Trace,
+    ) -> None:
+        self.world = world
+        self.trace = trace
+        self.echo = world.pin(echo_pin)
+        self.pings = 0
+        self.first_ping_us: int | None = None
+        world.pin(trigger_pin).listeners.append(self._on_trigger)
+
+    def _on_trigger(self, value: int) -> None:
+        if value or self.echo.value:
+            return
+
+        self.pings += 1
+        if self.first_ping_us is None:
+            self.first_ping_us = self.world.clock.now_us
+        distance = self.trace.distance_at(self.world.clock.now_s)
+        if distance is None:
+            pulse_us = self.MAX_ECHO_US
+        else:
+            pulse_us = int(2 * distance / SPEED_OF_SOUND_CM_PER_US)
+            pulse_us = min(pulse_us, self.MAX_ECHO_US)
+
+        clock = self.world.clock
+        clock.schedule(self.ECHO_DELAY_US, lambda: self.echo.set(1))
+        clock.schedule(self.ECHO_DELAY_US + pulse_us, lambda: self.echo.set(0))
+
+
+class ST7032Display:
+    ROW_ADDRESSES = (0x00, 0x40)
+    WIDTH = 8
+
+    def __init__(self, clock=None) -> None:
+        self.ddram = bytearray(b" " * 0x80)
+        self.address = 0
+        self.frames = 0
+        self.clock = clock
+        # When the first character reached DDRAM, if a clock was given
+        self.first_data_us: int | None = None
+
+    def write(self, data: bytes) -> None:
+        index = 0
+        while index < len(data):
+            control = data[index]
+            is_data = control & 0x40
+            if control & 0x80:
+                # Continuation: exactly one byte follows before the next control
+                payload = data[index + 1 : index + 2]
+                index += 2
+            else:
+                payload = data[index + 1 :]
+                index = len(data)
+
+            for byte in payload:
+                if is_data:
+                    if self.first_data_us is None and self.clock is not None:
+                        self.first_data_us = self.clock.now_us
+                    self.ddram[self.address & 0x7F] = byte
+                    self.address += 1
+                else:
+                    self._command(byte)
+
+        self.frames += 1
+
+    def _command(self, command: int) -> None:
+        if command & 0x80:
+            self.address = command & 0x7F
+        elif command == 0x01:
+            self.ddram[:] = b" " * len(self.ddram)
+            self.address = 0
+        elif command == 0x02:
+            self.address = 0
+
+    @property
+    def lines(self) -> list[str]:
+        return [
+            self.ddram[start : start + self.WIDTH].decode("latin-1")
+            for start in self.ROW_ADDRESSES
+        ]
@@ -0,0 +1,40 @@
+# An asyncio event loop on the simulation's virtual clock, so run_async()
+# sleeps in virtual time like the synchronous loop does
+
+import asyncio
+import math
+import selectors
+
+from .clock import VirtualClock
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout=None):
+        # Never blocks: waiting for the next timer is advancing the clock
+        ready = super().select(0)
+        if not ready and timeout:
+            # Rounded up, or the loop wakes just short of its next timer
+            self._clock.advance(math.ceil(timeout * 1_000_000))
+        return ready
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(_VirtualSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self) -> float:
+        return self._virtual_clock.now_s
+
+
+class VirtualEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__()
+        self._virtual_clock = clock
+
+    def new_event_loop(self) -> VirtualEventLoop:
+        return VirtualEventLoop(self._virtual_clock)
@@ -0,0 +1,82 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+
+from . import heap
+from .simulator import Simulation
+from .testing import CyclingReadings
+
+FilterCost = namedtuple(
+    "FilterCost", ["label", "us_per_sample", "heap_growth", "heap_growth_4x"]
+)
+
+
+def _pipelines() -> list[tuple[str, list]]:
+    from lib import EMAFilter, MedianFilter, OutlierFilter
+
+    return [
+        ("unfiltered", []),
+        ("median of 5", [MedianFilter(5)]),
+        ("median of 9", [MedianFilter(9)]),
+        ("EMA", [EMAFilter(0.3)]),
+        ("outlier", [OutlierFilter()]),
+        ("outlier+median5+EMA", [OutlierFilter(), MedianFilter(5), EMAFilter(0.3)]),
+    ]
+
+
+def heap_growth(sensor, samples: int) -> int:
+    # Bytes retained by another `samples` reads once the pipeline is warm.
+    # A float of filter state may differ; growth per sample would scale.
+    for _ in range(samples):
+        sensor.distance
+    gc.collect()
+    heap.reset()
+    for _ in range(samples):
+        sensor.distance
+    gc.collect()
+    return heap.mem_alloc()
+
+
+def measure(samples: int = 20_000) -> list[FilterCost]:
+    with Simulation():
+        from lib import FilteredDistanceSensor
+
+        results = []
+        for label, filters in _pipelines():
+            sensor = FilteredDistanceSensor(CyclingReadings(), filters)
+
+            started = time.perf_counter()
+            for _ in range(samples):
+                sensor.distance
+            us_per_sample = (time.perf_counter() - started) * 1e6 / samples
+
+            tracemalloc.start()
+            try:
+                growth = heap_growth(sensor, samples)
+                growth_4x = heap_growth(sensor, 4 * samples)
+            finally:
+                tracemalloc.stop()
+            results.append(FilterCost(label, us_per_sample, growth, growth_4x))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-sample cost and heap growth of the distance filters."
+    )
+    parser.add_argument("--samples", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'pipeline':22} {'us/sample':>9} {'heap after N':>12} {'after 4N':>9}")
+    for row in measure(args.samples):
+        print(
+            f"{row.label:22} {row.us_per_sample:9.2f} "
+            f"{row.heap_growth:10d} B {row.heap_growth_4x:7d} B"
+        )
+    print("CPython timings; compare pipelines with each other, not with the Pico.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import time
+from collections import namedtuple
+
+from .simulator import Simulation
+from .testing import visit_events
+
+FsmCost = namedtuple("FsmCost", ["label", "transitions_s", "state_reads_s"])
+
+
+# Best of several rounds, as timeit does, to keep scheduler noise out
+ROUNDS = 5
+
+
+def _time(step, arguments: list, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for argument in arguments:
+                step(argument)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _time_state_reads(fsm, count: int) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(count):
+            fsm.state
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(repeats: int = 20_000) -> list[FsmCost]:
+    # Seconds for `repeats` passes over the visit's events, and for as many
+    # reads of .state as events sent
+    with Simulation():
+        from states import EVENTS, STATES, TRANSITIONS, State
+
+        from lib import CompiledStateMachine, StateMachine
+
+        events = visit_events()
+        reads = repeats * len(events)
+
+        def compiled() -> CompiledStateMachine:
+            return CompiledStateMachine(
+                State.IDLE, TRANSITIONS, states=STATES, events=EVENTS
+            )
+
+        plain = StateMachine(State.IDLE, TRANSITIONS)
+        by_name = compiled()
+        by_id = compiled()
+        event_ids = [by_id.event_id_of(event) for event in events]
+
+        # What the firmware pays: the monitor sends event ids to a compiled
+        # machine, and names to a plain one
+        from loitering_monitor import LoiteringMonitor
+
+        readings = [True] * 6 + [False] * 4
+
+        def monitor(fsm) -> LoiteringMonitor:
+            return LoiteringMonitor(alert_after_seconds=2, timeout_seconds=1, fsm=fsm)
+
+        plain_monitor = monitor(StateMachine(State.IDLE, TRANSITIONS))
+        compiled_monitor = monitor(compiled())
+
+        return [
+            FsmCost(
+                "StateMachine.transition",
+                _time(plain.transition, events, repeats),
+                _time_state_reads(plain, reads),
+            ),
+            FsmCost(
+                "Compiled.transition",
+                _time(by_name.transition, events, repeats),
+                _time_state_reads(by_name, reads),
+            ),
+            FsmCost(
+                "Compiled.transition_id",
+                _time(by_id.transition_id, event_ids, repeats),
+                _time_state_reads(by_id, reads),
+            ),
+            FsmCost(
+                "monitor, StateMachine",
+                _time(plain_monitor.update, readings, repeats),
+                _time_state_reads(plain_monitor, reads),
+            ),
+            FsmCost(
+                "monitor, compiled",
+                _time(compiled_monitor.update, readings, repeats),
+                _time_state_reads(compiled_monitor, reads),
+            ),
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cost of state machine transitions and state reads."
+    )
+    parser.add_argument("--repeats", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'machine':24} {'transitions':>11} {'.state reads':>12}")
+    for row in measure(args.repeats):
+        print(
+            f"{row.label:24} {row.transitions_s:9.3f} s {row.state_reads_s:10.3f} s"
+        )
+    print("CPython timings; compare machines with each other, not with the Pico.")
+
+
+if __name__ == "__main__":
+    main()
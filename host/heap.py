@@ -0,0 +1,32 @@
+# Stand-ins for the MicroPython-only gc functions. Allocation is measured
+# with tracemalloc relative to the last reset(), and reads as zero when
+# tracemalloc is not tracing.
+import tracemalloc
+
+# Roughly the heap MicroPython has available on an RP2040
+HEAP_SIZE = 192 * 1024
+
+_threshold = -1
+_baseline = 0
+
+
+def reset() -> None:
+    global _baseline
+    _baseline = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def mem_alloc() -> int:
+    if not tracemalloc.is_tracing():
+        return 0
+    return max(0, tracemalloc.get_traced_memory()[0] - _baseline)
+
+
+def mem_free() -> int:
+    return max(0, HEAP_SIZE - mem_alloc())
+
+
+def threshold(amount: int | None = None) -> int | None:
+    global _threshold
+    if amount is None:
+        return _threshold
+    _threshold = amount
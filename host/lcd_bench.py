@@ -0,0 +1,84 @@
+import argparse
+from collections import namedtuple
+
+from .simulator import Simulation
+
+FrameCost = namedtuple("FrameCost", ["label", "transactions", "bytes", "bus_us"])
+
+
+def _frames(count: int) -> list[dict]:
+    # A target standing in range while the alert timer counts down
+    return [
+        {
+            "distance": 100 + (index % 7) / 10,
+            "state": "detected",
+            "time_to_alert": 300 - index,
+            "time_to_reset": 30,
+        }
+        for index in range(count)
+    ]
+
+
+def _per_character(lcd, frame: bytes) -> None:
+    # What write_line did before batching: one cursor command, then a
+    # transaction per character
+    for row, line in enumerate(bytes(frame).split(b"\n")):
+        lcd.set_ddram_address(lcd.VALID_ADDRESSES[row][0])
+        for byte in line:
+            lcd.send_data(byte)
+
+
+def measure(frame_count: int = 60) -> list[FrameCost]:
+    # Bus cost per frame of each LCD write path, on the simulated I2C bus
+    with Simulation() as simulation:
+        simulation.add_display()
+        world = simulation.world
+
+        from writers import lcd_formatter
+
+        from lib import AE_AQM0802
+
+        lcd = AE_AQM0802(clock_pin=17, data_pin=16)
+        frames = [bytes(lcd_formatter(data)) for data in _frames(frame_count)]
+
+        def cost(label: str, write) -> FrameCost:
+            transactions, sent = world.i2c_transactions, world.i2c_bytes
+            started_us = simulation.clock.now_us
+            for frame in frames:
+                write(frame)
+            return FrameCost(
+                label,
+                (world.i2c_transactions - transactions) / frame_count,
+                (world.i2c_bytes - sent) / frame_count,
+                (simulation.clock.now_us - started_us) / frame_count,
+            )
+
+        def full_redraw(frame: bytes) -> None:
+            lcd.invalidate()
+            lcd.write(frame)
+
+        return [
+            cost("per character", lambda frame: _per_character(lcd, frame)),
+            cost("batched, full redraw", full_redraw),
+            cost("batched, changed cells", lcd.write),
+            cost("batched, unchanged", lambda frame: lcd.write(frames[-1])),
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Count I2C transactions and bytes per LCD frame."
+    )
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'path':24} {'txns/frame':>10} {'bytes/frame':>11} {'bus us/frame':>12}")
+    for row in measure(args.frames):
+        print(
+            f"{row.label:24} {row.transactions:10.2f} "
+            f"{row.bytes:11.2f} {row.bus_us:12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
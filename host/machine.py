@@ -0,0 +1,163 @@
+# Stand-in for the MicroPython machine module, backed by a simulated World
+
+from .world import World
+
+world = World()
+
+
+def _pin_id(pin) -> object:
+    return pin.id if isinstance(pin, Pin) else pin
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode: int = -1, pull: int = -1, *, value=None) -> None:
+        self.id = _pin_id(id)
+        self.mode = mode
+        self.pull = pull
+        self._state = world.pin(self.id)
+        if value is not None:
+            self._state.set(value)
+
+    def init(self, mode: int = -1, pull: int = -1, *, value=None) -> None:
+        self.mode = mode
+        self.pull = pull
+        if value is not None:
+            self._state.set(value)
+
+    def value(self, value=None):
+        if value is None:
+            return self._state.value
+        self._state.set(value)
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def on(self) -> None:
+        self._state.set(1)
+
+    def off(self) -> None:
+        self._state.set(0)
+
+    high = on
+    low = off
+
+    def toggle(self) -> None:
+        self._state.set(1 - self._state.value)
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING | IRQ_RISING, hard=False):
+        self._state.irq_handler = handler
+        self._state.irq_trigger = trigger
+        self._state.irq_pin = self
+
+
+class PWM:
+    def __init__(self, dest, *, freq: int = 0, duty_u16: int = 0, **kwargs) -> None:
+        self.pin = dest
+        self._freq = freq
+        self._duty_u16 = duty_u16
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty_u16
+        self._duty_u16 = value
+
+    def deinit(self) -> None:
+        self._duty_u16 = 0
+
+
+class I2C:
+    def __init__(self, id=0, *, scl=None, sda=None, freq: int = 400_000) -> None:
+        self.id = id
+        self.freq = freq
+
+    def scan(self) -> list:
+        world.clock.advance(len(world.i2c_devices) * 100 + 1000)
+        return sorted(world.i2c_devices)
+
+    def writeto(self, addr: int, buf, stop: bool = True) -> int:
+        data = bytes(buf)
+        # Address byte plus payload, 9 clocks per byte
+        world.clock.advance((len(data) + 1) * 9 * 1_000_000 // self.freq)
+        world.i2c_write(addr, data)
+        return len(data)
+
+    def writevto(self, addr: int, vector, stop: bool = True) -> int:
+        return self.writeto(addr, b"".join(bytes(buf) for buf in vector), stop)
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id: int = -1, **kwargs) -> None:
+        self.id = id
+        self._generation = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(
+        self,
+        *,
+        mode: int = PERIODIC,
+        freq: float | None = None,
+        period: int | None = None,
+        callback=None,
+        **kwargs,
+    ) -> None:
+        self.deinit()
+        if freq is not None:
+            period_us = int(1_000_000 / freq)
+        else:
+            period_us = (1000 if period is None else period) * 1000
+        self._schedule(self._generation, mode, period_us, callback)
+
+    def deinit(self) -> None:
+        # Invalidates callbacks that are already queued on the clock
+        self._generation += 1
+
+    def _schedule(self, generation: int, mode: int, period_us: int, callback) -> None:
+        def fire():
+            if generation != self._generation:
+                return
+            if mode == self.PERIODIC:
+                self._schedule(generation, mode, period_us, callback)
+            if callback is not None:
+                callback(self)
+
+        world.clock.schedule(period_us, fire)
+
+
+def time_pulse_us(pin, pulse_level: int, timeout_us: int = 1_000_000) -> int:
+    state = world.pin(_pin_id(pin))
+    clock = world.clock
+
+    if not clock.run_until(
+        lambda: state.value == pulse_level, clock.now_us + timeout_us
+    ):
+        return -2
+
+    start_us = clock.now_us
+    if not clock.run_until(lambda: state.value != pulse_level, start_us + timeout_us):
+        return -1
+    return clock.now_us - start_us
+
+
+def freq(value=None):
+    return 125_000_000 if value is None else None
+
+
+def reset() -> None:
+    raise SystemExit("machine.reset() called")
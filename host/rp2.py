@@ -0,0 +1,374 @@
+# Stand-in for the MicroPython rp2 module. Programs are assembled from the
+# same Python source and interpreted against the simulated World, running
+# ahead of the virtual clock only while no other event can change a pin.
+
+import types
+
+from . import machine
+
+_WORD = 0xFFFFFFFF
+_FIFO_DEPTH = 4
+# How far a state machine runs ahead when nothing else is scheduled
+_RUN_AHEAD_US = 1000
+
+_NAMES = (
+    "block",
+    "gpio",
+    "isr",
+    "noblock",
+    "not_osre",
+    "not_x",
+    "not_y",
+    "null",
+    "osr",
+    "pc",
+    "pin",
+    "pindirs",
+    "pins",
+    "x",
+    "x_dec",
+    "x_not_y",
+    "y",
+    "y_dec",
+)
+
+
+class PIO:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+
+class _Instruction:
+    def __init__(self, op: str, args: tuple) -> None:
+        self.op = op
+        self.args = args
+        self.delay = 0
+
+    def __getitem__(self, delay: int) -> "_Instruction":
+        if not 0 <= delay <= 31:
+            raise ValueError("delay must be between 0 and 31")
+        self.delay = delay
+        return self
+
+    def side(self, value: int) -> "_Instruction":
+        return self
+
+
+class Program:
+    def __init__(self, options: dict) -> None:
+        self.options = options
+        self.instructions: list[_Instruction] = []
+        self.labels: dict[str, int] = {}
+        self.wrap_target = 0
+        self.wrap: int | None = None
+
+    def _emit(self, op: str, *args) -> _Instruction:
+        if len(self.instructions) == 32:
+            raise ValueError("PIO programs are limited to 32 instructions")
+        instruction = _Instruction(op, args)
+        self.instructions.append(instruction)
+        return instruction
+
+    def _builders(self) -> dict:
+        builders = {name: name for name in _NAMES}
+
+        def label(name: str) -> None:
+            self.labels[name] = len(self.instructions)
+
+        def wrap_target() -> None:
+            self.wrap_target = len(self.instructions)
+
+        def wrap() -> None:
+            self.wrap = len(self.instructions) - 1
+
+        def jmp(condition, target=None):
+            if target is None:
+                condition, target = None, condition
+            return self._emit("jmp", condition, target)
+
+        builders.update(
+            label=label,
+            wrap_target=wrap_target,
+            wrap=wrap,
+            jmp=jmp,
+            invert=lambda source: ("invert", source),
+            rel=lambda index: ("rel", index),
+            nop=lambda: self._emit("mov", "y", "y"),
+        )
+        for op in ("mov", "set", "wait", "pull", "push", "in_", "out", "irq"):
+            builders[op] = lambda *args, op=op: self._emit(op, *args)
+        return builders
+
+
+def asm_pio(**options):
+    def assemble(function) -> Program:
+        program = Program(options)
+        namespace = dict(function.__globals__)
+        namespace.update(program._builders())
+        types.FunctionType(function.__code__, namespace)()
+        if program.wrap is None:
+            program.wrap = len(program.instructions) - 1
+        return program
+
+    return assemble
+
+
+class StateMachine:
+    def __init__(self, id: int, program: Program | None = None, **kwargs) -> None:
+        self.id = id
+        self._active = False
+        self._generation = 0
+        self._rx: list[int] = []
+        self._tx: list[int] = []
+        self._irq_handler = None
+        if program is not None:
+            self.init(program, **kwargs)
+
+    def init(
+        self,
+        program: Program,
+        freq: int = 125_000_000,
+        *,
+        set_base=None,
+        in_base=None,
+        jmp_pin=None,
+        **kwargs,
+    ) -> None:
+        self.active(0)
+        self.program = program
+        self.freq = freq
+        self._set_base = None if set_base is None else machine.world.pin(set_base.id)
+        self._in_base = None if in_base is None else machine.world.pin(in_base.id)
+        self._jmp_pin = None if jmp_pin is None else machine.world.pin(jmp_pin.id)
+        if self._set_base is not None and program.options.get("set_init") in (
+            PIO.OUT_LOW,
+            PIO.OUT_HIGH,
+        ):
+            self._set_base.set(program.options["set_init"] == PIO.OUT_HIGH)
+        self.restart()
+
+    def restart(self) -> None:
+        self._pc = 0
+        self._registers = {"x": 0, "y": 0, "isr": 0, "osr": 0}
+        self._osr_empty = True
+        self._rx.clear()
+        self._tx.clear()
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+        self._generation += 1
+        if self._active:
+            self._epoch_us = machine.world.clock.now_us
+            self._cycles = 0
+            self._schedule(0)
+
+    def put(self, value: int, shift: int = 0) -> None:
+        clock = machine.world.clock
+        if not clock.run_until(lambda: len(self._tx) < _FIFO_DEPTH, clock.end_us or 1 << 62):
+            raise OSError("TX FIFO stalled")
+        self._tx.append((value >> shift) & _WORD)
+        if self._active:
+            self._resume()
+
+    def get(self, buf=None, shift: int = 0) -> int:
+        clock = machine.world.clock
+        clock.run_until(lambda: bool(self._rx), clock.end_us or 1 << 62)
+        return self._rx.pop(0) >> shift
+
+    def irq(self, handler=None, trigger: int = 0, hard: bool = False) -> None:
+        # Soft IRQs only: the handler runs as its own event once `irq` sets
+        # a flag, as a scheduled callback would
+        self._irq_handler = handler
+
+    def rx_fifo(self) -> int:
+        return len(self._rx)
+
+    def tx_fifo(self) -> int:
+        return len(self._tx)
+
+    # Interpreter
+
+    def _now_us(self) -> int:
+        return self._epoch_us + self._cycles * 1_000_000 // self.freq
+
+    def _cycles_at(self, time_us: int) -> int:
+        return -(-(time_us - self._epoch_us) * self.freq // 1_000_000)
+
+    def _resume(self) -> None:
+        # Catch the local time up with the clock before running on
+        clock = machine.world.clock
+        if self._now_us() < clock.now_us:
+            self._cycles = self._cycles_at(clock.now_us)
+        self._schedule(0)
+
+    def _schedule(self, delay_us: int) -> None:
+        self._generation += 1
+        generation = self._generation
+        machine.world.clock.schedule(delay_us, lambda: self._run(generation))
+
+    def _run(self, generation: int) -> None:
+        if generation != self._generation or not self._active:
+            return
+
+        clock = machine.world.clock
+        horizon = clock.next_event_us()
+        if horizon is None:
+            horizon = clock.now_us + _RUN_AHEAD_US
+        while True:
+            now_us = self._now_us()
+            if now_us > clock.now_us and now_us >= horizon:
+                # Another event may change a pin first
+                self._schedule(now_us - clock.now_us)
+                return
+
+            instruction = self.program.instructions[self._pc]
+            if self._skip_delay_loop(instruction, horizon):
+                continue
+            if instruction.op in ("set", "push", "irq") and now_us > clock.now_us:
+                # Effects outside the state machine happen on the clock
+                self._schedule(now_us - clock.now_us)
+                return
+
+            if not self._execute(instruction):
+                # Stalled: nothing changes before the next event
+                self._cycles = self._cycles_at(max(horizon, now_us))
+                self._schedule(self._now_us() - clock.now_us)
+                return
+
+            self._cycles += 1 + instruction.delay
+            if instruction.op in ("set", "push", "irq"):
+                self._schedule(self._now_us() - clock.now_us)
+                return
+
+    def _skip_delay_loop(self, instruction: _Instruction, horizon: int) -> bool:
+        # Runs a `jmp(x_dec, self)` countdown up to the horizon in one go
+        if instruction.op != "jmp" or instruction.args[0] not in ("x_dec", "y_dec"):
+            return False
+        if self.program.labels[instruction.args[1]] != self._pc:
+            return False
+
+        register = instruction.args[0][0]
+        cost = 1 + instruction.delay
+        loops = min(
+            self._registers[register],
+            (self._cycles_at(horizon) - self._cycles) // cost,
+        )
+        if loops <= 0:
+            return False
+        self._registers[register] -= loops
+        self._cycles += loops * cost
+        return True
+
+    def _advance_pc(self) -> None:
+        if self._pc == self.program.wrap:
+            self._pc = self.program.wrap_target
+        else:
+            self._pc += 1
+
+    def _execute(self, instruction: _Instruction) -> bool:
+        # Returns False when the instruction stalls
+        op, args = instruction.op, instruction.args
+        registers = self._registers
+
+        if op == "jmp":
+            condition, target = args
+            if self._condition(condition):
+                self._pc = self.program.labels[target]
+            else:
+                self._advance_pc()
+            return True
+
+        if op == "wait":
+            polarity, source, index = args
+            if self._read_pin(source, index) != polarity:
+                return False
+        elif op == "mov":
+            destination, source = args
+            value = self._source(source)
+            if destination == "pins":
+                raise NotImplementedError("mov to pins is not simulated")
+            registers[destination] = value
+            if destination == "osr":
+                self._osr_empty = False
+        elif op == "set":
+            destination, value = args
+            if destination == "pins":
+                self._set_base.set(value & 1)
+            elif destination in ("x", "y"):
+                registers[destination] = value
+        elif op == "pull":
+            mode = args[0] if args else "block"
+            if self._tx:
+                registers["osr"] = self._tx.pop(0)
+            elif mode == "block":
+                return False
+            else:
+                registers["osr"] = registers["x"]
+            self._osr_empty = False
+        elif op == "push":
+            mode = args[0] if args else "block"
+            if len(self._rx) < _FIFO_DEPTH:
+                self._rx.append(registers["isr"])
+                registers["isr"] = 0
+            elif mode == "block":
+                return False
+        elif op == "irq":
+            if len(args) != 1:
+                raise NotImplementedError("only setting an IRQ flag is simulated")
+            handler = self._irq_handler
+            if handler is not None:
+                machine.world.clock.schedule(0, lambda: handler(self))
+        else:
+            raise NotImplementedError(f"{op} is not simulated")
+
+        self._advance_pc()
+        return True
+
+    def _condition(self, condition) -> bool:
+        registers = self._registers
+        if condition is None:
+            return True
+        if condition in ("x_dec", "y_dec"):
+            register = condition[0]
+            value = registers[register]
+            registers[register] = (value - 1) & _WORD
+            return value != 0
+        if condition == "not_x":
+            return registers["x"] == 0
+        if condition == "not_y":
+            return registers["y"] == 0
+        if condition == "x_not_y":
+            return registers["x"] != registers["y"]
+        if condition == "pin":
+            return self._jmp_pin.value == 1
+        if condition == "not_osre":
+            return not self._osr_empty
+        raise ValueError(f"Unknown jump condition {condition}")
+
+    def _source(self, source) -> int:
+        if isinstance(source, tuple):
+            return ~self._source(source[1]) & _WORD
+        if source == "null":
+            return 0
+        if source == "pins":
+            return self._in_base.value
+        return self._registers[source]
+
+    def _read_pin(self, source: str, index: int) -> int:
+        if source == "pin":
+            if index:
+                raise NotImplementedError("only in_base itself is simulated")
+            return self._in_base.value
+        return machine.world.pin(index).value
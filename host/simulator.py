@@ -0,0 +1,151 @@
+import asyncio
+import gc
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from . import heap, machine, rp2, threads
+from .clock import SimulationComplete, VirtualClock
+from .devices import SimulatedHC_SR04, ST7032Display, Trace
+from .event_loop import VirtualEventLoopPolicy
+from .world import World
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "src"
+
+_TIME_FUNCTIONS = (
+    "sleep",
+    "sleep_ms",
+    "sleep_us",
+    "ticks_ms",
+    "ticks_us",
+    "ticks_cpu",
+    "ticks_add",
+    "ticks_diff",
+)
+
+_GC_FUNCTIONS = ("mem_alloc", "mem_free", "threshold")
+
+Transition = namedtuple("Transition", ["time_s", "state"])
+
+
+def unload_firmware() -> None:
+    # Drops every module imported from src, so the next import is cold and
+    # binds to the currently installed simulation
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if path.startswith(str(SOURCE_DIR)):
+            del sys.modules[name]
+
+
+class Simulation:
+    def __init__(self) -> None:
+        self.world = World(VirtualClock())
+        self.sensors: list[SimulatedHC_SR04] = []
+        self.displays: dict[int, ST7032Display] = {}
+        self.timeline: list[Transition] = []
+        self._saved_modules: dict = {}
+        self._saved_time: dict = {}
+        self._saved_gc: dict = {}
+        self._saved_policy = None
+
+    @property
+    def clock(self) -> VirtualClock:
+        return self.world.clock
+
+    def add_sensor(
+        self,
+        trace: Trace,
+        *,
+        trigger_pin: int = 14,
+        echo_pin: int = 15,
+    ) -> SimulatedHC_SR04:
+        sensor = SimulatedHC_SR04(self.world, trigger_pin, echo_pin, trace)
+        self.sensors.append(sensor)
+        return sensor
+
+    def add_display(self, addr: int = 0x3E) -> ST7032Display:
+        display = ST7032Display(self.clock)
+        self.displays[addr] = display
+        self.world.i2c_devices[addr] = display
+        return display
+
+    def install(self) -> None:
+        # Source modules must be imported after this so they bind the fakes
+        machine.world = self.world
+        for name, module in (
+            ("machine", machine),
+            ("rp2", rp2),
+            ("_thread", threads),
+            ("ucollections", sys.modules["collections"]),
+        ):
+            self._saved_modules[name] = sys.modules.get(name)
+            sys.modules[name] = module
+
+        for name in _TIME_FUNCTIONS:
+            self._saved_time[name] = getattr(time, name, None)
+            setattr(time, name, getattr(self.clock, name))
+
+        for name in _GC_FUNCTIONS:
+            self._saved_gc[name] = getattr(gc, name, None)
+            setattr(gc, name, getattr(heap, name))
+
+        self._saved_policy = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(VirtualEventLoopPolicy(self.clock))
+
+        if str(SOURCE_DIR) not in sys.path:
+            sys.path.insert(0, str(SOURCE_DIR))
+
+    def uninstall(self) -> None:
+        if self._saved_policy is not None:
+            asyncio.set_event_loop_policy(self._saved_policy)
+            self._saved_policy = None
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        for module, saved in ((time, self._saved_time), (gc, self._saved_gc)):
+            for name, function in saved.items():
+                if function is None:
+                    delattr(module, name)
+                else:
+                    setattr(module, name, function)
+            saved.clear()
+        self._saved_modules.clear()
+
+    def __enter__(self) -> "Simulation":
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+    def run(self, target, duration_s: float, *, monitor=None) -> list[Transition]:
+        # Runs `target` (usually LoiteringAlarm.run) until the virtual clock
+        # reaches `duration_s`, recording the monitor's state changes.
+        if monitor is not None:
+            self._record(monitor)
+            self.clock.observers.append(lambda clock: self._record(monitor))
+
+        self.clock.end_us = self.clock.now_us + int(duration_s * 1_000_000)
+        # Count the heap from here on, past the firmware's own imports
+        heap.reset()
+        try:
+            target()
+        except SimulationComplete:
+            pass
+        finally:
+            self.clock.end_us = None
+            self.clock.observers.clear()
+        return self.timeline
+
+    def _record(self, monitor) -> None:
+        if not self.timeline or self.timeline[-1].state != monitor.state:
+            self.timeline.append(Transition(self.clock.now_s, monitor.state))
+
+    def format_timeline(self) -> str:
+        return "\n".join(
+            f"{transition.time_s:9.3f} s  {transition.state}"
+            for transition in self.timeline
+        )
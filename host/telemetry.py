@@ -0,0 +1,133 @@
+import argparse
+import binascii
+import csv
+import struct
+import sys
+from collections import namedtuple
+
+# Must match src/telemetry.py and src/states.py
+FRAME_FORMAT = "<BBHBBHIIH"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+SYNC = bytes([0xA5, 0x5A])
+FLAG_HAS_DISTANCE = 0x01
+STATES = ("idle", "detected", "alarm", "armed", "occluded")
+
+Frame = namedtuple(
+    "Frame",
+    ["sequence", "state", "distance_cm", "time_to_alert_s", "time_to_reset_s"],
+)
+
+
+class Decoder:
+    def __init__(self) -> None:
+        self._pending = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.lost = 0
+        self._last_sequence: int | None = None
+
+    def feed(self, data: bytes) -> list[Frame]:
+        self._pending.extend(data)
+        frames = []
+        while True:
+            start = self._pending.find(SYNC)
+            if start < 0:
+                # Keep a trailing partial sync byte
+                del self._pending[: max(0, len(self._pending) - 1)]
+                return frames
+            if len(self._pending) - start < FRAME_SIZE:
+                del self._pending[:start]
+                return frames
+
+            raw = bytes(self._pending[start : start + FRAME_SIZE])
+            fields = struct.unpack(FRAME_FORMAT, raw)
+            if binascii.crc_hqx(raw[2:-2], 0xFFFF) != fields[-1]:
+                # Not a real frame boundary; resynchronise one byte later
+                self.crc_errors += 1
+                del self._pending[: start + 1]
+                continue
+
+            del self._pending[: start + FRAME_SIZE]
+            frames.append(self._frame(fields))
+
+    def _frame(self, fields: tuple) -> Frame:
+        _, _, sequence, state_id, flags, distance_mm, alert_ms, reset_ms, _ = fields
+        if self._last_sequence is not None:
+            self.lost += (sequence - self._last_sequence - 1) & 0xFFFF
+        self._last_sequence = sequence
+        self.frames += 1
+
+        return Frame(
+            sequence=sequence,
+            state=STATES[state_id] if state_id < len(STATES) else str(state_id),
+            distance_cm=distance_mm / 10 if flags & FLAG_HAS_DISTANCE else None,
+            time_to_alert_s=alert_ms / 1000,
+            time_to_reset_s=reset_ms / 1000,
+        )
+
+
+def read_frames(stream, chunk_size: int = 4096):
+    decoder = Decoder()
+    while chunk := stream.read(chunk_size):
+        yield from decoder.feed(chunk)
+
+
+def to_numpy(frames):
+    import numpy as np
+
+    dtype = [
+        ("sequence", "u2"),
+        ("state", "u1"),
+        ("distance_cm", "f4"),
+        ("time_to_alert_s", "f4"),
+        ("time_to_reset_s", "f4"),
+    ]
+    return np.array(
+        [
+            (
+                frame.sequence,
+                STATES.index(frame.state) if frame.state in STATES else 255,
+                float("nan") if frame.distance_cm is None else frame.distance_cm,
+                frame.time_to_alert_s,
+                frame.time_to_reset_s,
+            )
+            for frame in frames
+        ],
+        dtype=dtype,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Decode binary telemetry frames from the alarm."
+    )
+    parser.add_argument(
+        "source", help="capture file or serial device such as /dev/ttyACM0; - for stdin"
+    )
+    parser.add_argument("--npy", help="write a NumPy structured array instead of CSV")
+    args = parser.parse_args()
+
+    stream = (
+        sys.stdin.buffer
+        if args.source == "-"
+        else open(args.source, "rb", buffering=0)
+    )
+    with stream:
+        if args.npy:
+            import numpy as np
+
+            np.save(args.npy, to_numpy(read_frames(stream)))
+            return
+
+        writer = csv.writer(sys.stdout)
+        writer.writerow(Frame._fields)
+        try:
+            for frame in read_frames(stream):
+                writer.writerow(frame)
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
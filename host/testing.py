@@ -0,0 +1,61 @@
+# Sources and builders shared by the host tests and benchmarks. Anything that
+# imports firmware must be called inside an installed Simulation.
+
+
+class CyclingReadings:
+    # Cycles through precomputed readings, so the source allocates nothing
+    def __init__(self, count: int = 256) -> None:
+        self._values = [
+            # A target near 100 cm with jitter and an occasional spurious echo
+            300.0 if index % 37 == 0 else 100.0 + (index * 7919 % 11) / 5
+            for index in range(count)
+        ]
+        self._index = 0
+
+    @property
+    def distance(self) -> float:
+        value = self._values[self._index]
+        self._index = (self._index + 1) % len(self._values)
+        return value
+
+
+def visit_events() -> list[str]:
+    from states import Event
+
+    # A visit: arrive, stay, leave and time out, with misses along the way
+    return [
+        Event.TARGET_IN_RANGE,
+        Event.TARGET_IN_RANGE,
+        Event.TARGET_OUT_OF_RANGE,
+        Event.TARGET_IN_RANGE,
+        Event.ALERT_TIME_REACHED,
+        Event.TARGET_IN_RANGE,
+        Event.TARGET_OUT_OF_RANGE,
+        Event.TARGET_OUT_OF_RANGE,
+        Event.OCCLUSION_TIMEOUT,
+        Event.TARGET_OUT_OF_RANGE,
+    ]
+
+
+def build_alarm(*, distance_sensor=None, display=None, monitor=None, **options):
+    # The wiring of main.py: sensor on pins 14/15, display on 17/16 and a
+    # passive buzzer on 13, which is what Simulation.add_sensor and
+    # add_display expect
+    from loitering_alarm import LoiteringAlarm
+    from loitering_monitor import LoiteringMonitor
+
+    from lib import AE_AQM0802, HC_SR04, Buzzer
+
+    if distance_sensor is None:
+        distance_sensor = HC_SR04(trigger_pin=14, echo_pin=15)
+    if display is None:
+        display = AE_AQM0802(clock_pin=17, data_pin=16)
+    if monitor is None:
+        monitor = LoiteringMonitor()
+    return LoiteringAlarm(
+        distance_sensor=distance_sensor,
+        display=display,
+        buzzer=Buzzer(pin_number=13, is_active=False),
+        monitor=monitor,
+        **options,
+    )
@@ -0,0 +1,20 @@
+import pytest
+
+from host.simulator import Simulation, unload_firmware
+from host.testing import build_alarm
+
+
+@pytest.fixture
+def simulation():
+    # Firmware modules are imported fresh inside every simulation
+    unload_firmware()
+    with Simulation() as simulation:
+        yield simulation
+    unload_firmware()
+
+
+@pytest.fixture
+def make_alarm(simulation):
+    # Builds a LoiteringAlarm wired to the simulation's default pins;
+    # keyword arguments replace its parts or pass through as options
+    return build_alarm
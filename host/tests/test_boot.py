@@ -0,0 +1,25 @@
+from host.boot import measure_boot
+
+
+def test_deferred_init_samples_first_and_draws_as_soon_as_blocking():
+    blocking = measure_boot(defer_init=False, duration_s=2)
+    deferred = measure_boot(defer_init=True, duration_s=2)
+
+    assert deferred.first_sample_ms < blocking.first_sample_ms
+    # Each initialisation step runs when due, not at the next sample
+    assert deferred.first_frame_ms <= blocking.first_frame_ms + 10
+
+
+def test_boot_leaves_unused_options_unimported():
+    modules = measure_boot(defer_init=True, duration_s=1).modules
+
+    for name in (
+        "dual_core",
+        "instrumentation",
+        "lib.distance.burst",
+        "lib.distance.filters",
+        "lib.distance.group",
+        "lib.trace",
+        "telemetry",
+    ):
+        assert name not in modules
@@ -0,0 +1,61 @@
+import pytest
+
+from host import Trace
+
+_START_S = 1.0
+# Matches BurstDistanceSensor's default spacing for a 10 ms echo timeout
+_SPACING_S = 0.025
+
+
+def _pings(distances: list) -> Trace:
+    # One step per ping, each centred on when that ping goes out
+    steps = [(0, 160)]
+    for index, distance in enumerate(distances):
+        steps.append((_START_S + (index - 0.5) * _SPACING_S, distance))
+    steps.append((_START_S + (len(distances) - 0.5) * _SPACING_S, 160))
+    return Trace(steps)
+
+
+def _measure(simulation, distances: list, **options):
+    simulation.add_sensor(_pings(distances))
+
+    from lib import HC_SR04, BurstDistanceSensor
+
+    burst = BurstDistanceSensor(
+        HC_SR04(trigger_pin=14, echo_pin=15), pings=len(distances), **options
+    )
+    simulation.clock.advance(int(_START_S * 1_000_000))
+    return burst.measure()
+
+
+def test_a_mixed_burst_reports_the_median_and_its_confidence(simulation):
+    # A stray far echo among readings that agree, then a lost one. Lost
+    # echoes hold the echo line for 38 ms, so it comes last so as not to
+    # swallow another ping.
+    reading = _measure(simulation, [100, 101, 130, 99, None])
+
+    assert reading.valid == 4
+    assert reading.valid_ratio == pytest.approx(0.8)
+    # The far echo moves neither the median nor the trimmed mean
+    assert reading.median == pytest.approx(100.5, abs=0.2)
+    assert reading.trimmed_mean == pytest.approx(100.5, abs=0.2)
+    assert reading.distance == reading.median
+    # Trimmed, the rest agree within 1 cm of the 10 cm tolerance
+    assert reading.spread_cm == pytest.approx(1, abs=0.2)
+    assert reading.confidence == pytest.approx(0.8 * 0.9, abs=0.02)
+
+
+def test_too_few_echoes_give_no_distance(simulation):
+    reading = _measure(simulation, [100, None, None, 120, None])
+
+    assert reading.valid == 2
+    assert reading.distance is None
+    # Nothing to trim from two, so their whole 20 cm spread counts
+    assert reading.median == pytest.approx(110, abs=0.2)
+    assert reading.confidence == 0
+
+
+def test_no_echoes_give_no_confidence(simulation):
+    reading = _measure(simulation, [None, None, None])
+
+    assert (reading.valid, reading.distance, reading.confidence) == (0, None, 0)
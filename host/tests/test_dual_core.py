@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+from host import Trace
+
+
+class _Status:
+    # Every field carries the publish number, so a torn copy shows up
+    def __init__(self, states: tuple) -> None:
+        self._states = states
+        self.number = 0
+
+    @property
+    def state(self) -> str:
+        return self._states[self.number % len(self._states)]
+
+    @property
+    def time_to_alert(self) -> float:
+        return self.number
+
+    @property
+    def time_to_reset(self) -> float:
+        return self.number
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.number
+
+
+def test_snapshot_ring_under_concurrent_publish_and_take(simulation):
+    from dual_core import Snapshot, SnapshotRing
+    from states import STATES
+
+    ring = SnapshotRing(4)
+    status = _Status(STATES)
+    publishes = 20_000
+    done = threading.Event()
+
+    def produce() -> None:
+        for number in range(1, publishes + 1):
+            status.number = number
+            # Floats stored in the ring are single precision, exact up to 2**24
+            ring.publish(float(number), status)
+        done.set()
+
+    snapshot = Snapshot()
+    seen = []
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while not done.is_set() or len(ring):
+        if ring.take_latest(snapshot):
+            number = int(snapshot.distance)
+            assert snapshot.time_to_alert == number
+            assert snapshot.time_to_reset == number
+            assert snapshot.elapsed_time == number
+            assert snapshot.state == STATES[number % len(STATES)]
+            seen.append(number)
+    producer.join()
+
+    assert seen == sorted(seen)
+    assert len(set(seen)) == len(seen)
+    assert seen[-1] == publishes
+    assert ring.published == publishes
+    assert ring.published - ring.overwritten >= len(seen)
+
+
+class _FailingSensor:
+    @property
+    def distance(self) -> float | None:
+        raise OSError("sensor unplugged")
+
+
+def test_a_producer_fault_is_raised_on_the_ui_core(simulation, make_alarm):
+    simulation.add_display()
+    alarm = make_alarm(distance_sensor=_FailingSensor())
+
+    with pytest.raises(OSError, match="sensor unplugged"):
+        simulation.run(alarm.run_dual_core, 5)
+    assert isinstance(alarm.producer_error, OSError)
+    assert not alarm.sequencer.is_playing
+
+
+def test_a_dual_core_run_matches_run(simulation, make_alarm):
+    simulation.add_sensor(
+        Trace.visit(arrive_s=5, leave_s=60, distance_cm=100, background_cm=160)
+    )
+    display = simulation.add_display()
+
+    from loitering_monitor import LoiteringMonitor
+
+    monitor = LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10)
+    alarm = make_alarm(monitor=monitor)
+    shown = {}
+
+    def check() -> None:
+        shown[monitor.state] = (alarm.sequencer.is_playing, display.lines[0])
+        shown["published"] = alarm.snapshots.published
+
+    simulation.clock.schedule(40_000_000, check)
+    timeline = simulation.run(alarm.run_dual_core, 100, monitor=monitor)
+
+    assert [step.state for step in timeline] == [
+        "idle",
+        "detected",
+        "alarm",
+        "armed",
+        "idle",
+    ]
+    # The UI core acted on and drew what the sensing core published
+    assert shown.pop("published") > 0
+    assert shown == {"alarm": (True, "100.0 AL")}
+    # Back in single-core mode afterwards
+    assert alarm.snapshots is None
+    assert alarm._status is monitor
+
+
+def test_stop_ends_run_async(simulation, make_alarm):
+    simulation.add_sensor(Trace([(0, 160)]))
+    simulation.add_display()
+    alarm = make_alarm()
+
+    simulation.clock.schedule(10_000_000, alarm.stop)
+    simulation.run(alarm.run_async, 60)
+
+    assert simulation.clock.now_s < 11
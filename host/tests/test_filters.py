@@ -0,0 +1,27 @@
+import tracemalloc
+
+from host.filter_bench import heap_growth
+from host.testing import CyclingReadings
+
+
+def test_filter_pipeline_heap_stays_flat(simulation):
+    from lib import EMAFilter, FilteredDistanceSensor, MedianFilter, OutlierFilter
+
+    sensor = FilteredDistanceSensor(
+        CyclingReadings(), [OutlierFilter(), MedianFilter(5), EMAFilter(0.3)]
+    )
+    tracemalloc.start()
+    try:
+        # At most the odd float of filter state, never anything per sample
+        assert heap_growth(sensor, 2_000) <= 64
+        assert heap_growth(sensor, 8_000) <= 64
+    finally:
+        tracemalloc.stop()
+
+
+def test_median_filter_ignores_a_single_spurious_echo(simulation):
+    from lib import MedianFilter
+
+    median = MedianFilter(5)
+    outputs = [median.update(value) for value in (100, 101, 300, 99, 100)]
+    assert max(outputs) <= 101
@@ -0,0 +1,70 @@
+import pytest
+
+from host import ScriptedPin
+
+# 100 cm there and back at 343 m/s
+ECHO_100_CM_US = 5831
+
+
+@pytest.fixture
+def sensor(simulation):
+    from lib import HC_SR04_IRQ
+
+    return HC_SR04_IRQ(trigger_pin=14, echo_pin=15, echo_timeout_us=10_000)
+
+
+@pytest.fixture
+def echo(simulation):
+    return ScriptedPin(simulation.world, 15)
+
+
+def test_ping_returns_before_the_echo(simulation, sensor, echo):
+    sensor.ping()
+    echo.script([(500, 1), (500 + ECHO_100_CM_US, 0)])
+
+    assert sensor.is_pending
+    assert sensor.reading is None
+
+    simulation.clock.advance(7_000)
+    assert not sensor.is_pending
+    assert sensor.reading == pytest.approx(100, abs=0.1)
+    assert sensor.age_us == 7_000 - 500 - ECHO_100_CM_US
+
+
+def test_ping_while_pending_does_not_retrigger(simulation, sensor, echo):
+    triggers = []
+    simulation.world.pin(14).listeners.append(triggers.append)
+
+    sensor.ping()
+    sensor.ping()
+    assert triggers.count(1) == 1
+
+    echo.script([(500, 1), (1_000, 0)])
+    simulation.clock.advance(2_000)
+    sensor.ping()
+    assert triggers.count(1) == 2
+
+
+def test_missing_echo_times_out(simulation, sensor):
+    sensor.ping()
+    simulation.clock.advance(15_000)
+    assert sensor.is_pending
+
+    simulation.clock.advance(10_000)
+    assert not sensor.is_pending
+    assert sensor.reading is None
+
+
+def test_distance_returns_last_reading_and_pings_again(simulation, sensor, echo):
+    assert sensor.distance is None
+    echo.script([(500, 1), (500 + ECHO_100_CM_US, 0)])
+    simulation.clock.advance(7_000)
+
+    assert sensor.distance == pytest.approx(100, abs=0.1)
+    assert sensor.is_pending
+
+
+def test_edges_without_a_ping_are_ignored(simulation, sensor, echo):
+    echo.script([(100, 1), (600, 0)])
+    simulation.clock.advance(1_000)
+    assert sensor.reading is None
@@ -0,0 +1,65 @@
+import pytest
+
+from host import Trace
+
+
+def test_distance_follows_a_moving_target(simulation):
+    simulation.add_sensor(Trace([(0, 100), (1.3, 50)]))
+
+    from lib import HC_SR04_PIO
+
+    sensor = HC_SR04_PIO(trigger_pin=14, echo_pin=15)
+    simulation.clock.advance(1_000_000)
+    assert sensor.distance == pytest.approx(100, abs=0.5)
+
+    # Long enough for the four-entry RX FIFO to fill several times over
+    simulation.clock.advance(500_000)
+    assert sensor.distance == pytest.approx(50, abs=0.5)
+    assert sensor.readings > 8
+
+
+class _InterruptingStateMachine:
+    # Delivers the result IRQ right after any FIFO check made outside the
+    # handler, the worst moment for code that checks and then reads
+    def __init__(self, sm, handler) -> None:
+        self._sm = sm
+        self._handler = handler
+        self._in_handler = False
+
+    def rx_fifo(self) -> int:
+        count = self._sm.rx_fifo()
+        if not self._in_handler:
+            self.interrupt()
+        return count
+
+    def get(self) -> int:
+        return self._sm.get()
+
+    def interrupt(self) -> None:
+        self._in_handler = True
+        try:
+            self._handler(self)
+        finally:
+            self._in_handler = False
+
+
+def test_reading_distance_never_waits_when_the_irq_drains_first(simulation):
+    simulation.add_sensor(Trace([(0, 100)]))
+
+    from lib import HC_SR04_PIO
+
+    sensor = HC_SR04_PIO(trigger_pin=14, echo_pin=15)
+    sm = _InterruptingStateMachine(sensor._sm, sensor._on_result)
+    sensor._sm = sm
+    # Leave results in the FIFO with the IRQ not yet delivered
+    sensor._sm._sm.irq(None)
+    simulation.clock.advance(100_000)
+
+    now_us = simulation.clock.now_us
+    first = sensor.distance
+    sm.interrupt()
+    second = sensor.distance
+    assert simulation.clock.now_us == now_us
+    # Results reach distance through the handler alone
+    assert first is None
+    assert second == pytest.approx(100, abs=0.5)
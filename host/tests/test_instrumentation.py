@@ -0,0 +1,16 @@
+def test_profiler_means_survive_hours_of_stage_time(simulation):
+    from instrumentation import LoopProfiler
+    from stages import Stage
+
+    profiler = LoopProfiler()
+    # Two hours of ranging, past where microsecond totals wrap
+    for duration_us in (1_000_250, 999_750) * 3_600:
+        profiler.start()
+        simulation.clock.advance(duration_us)
+        profiler.mark(Stage.RANGING)
+
+    lines = []
+    profiler.dump(lines.append)
+
+    count, mean_us, max_us = lines[1].split()[1:4]
+    assert (count, mean_us, max_us) == ("7200", "1000000", "1000250")
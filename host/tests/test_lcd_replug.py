@@ -0,0 +1,51 @@
+import pytest
+
+from host import Trace
+
+
+def _replug(simulation, unplug_s: float, replug_s: float) -> list:
+    replugged = []
+
+    def unplug() -> None:
+        del simulation.world.i2c_devices[0x3E]
+
+    def replug() -> None:
+        # Powered up again, so the controller and its DDRAM start blank
+        replugged.append(simulation.add_display())
+
+    simulation.clock.schedule(int(unplug_s * 1_000_000), unplug)
+    simulation.clock.schedule(int(replug_s * 1_000_000), replug)
+    return replugged
+
+
+def test_a_display_replugged_while_the_frame_changes_is_redrawn(
+    simulation, make_alarm
+):
+    simulation.add_sensor(Trace([(0, 160), (3, 170)]))
+    simulation.add_display()
+    replugged = _replug(simulation, 2, 5)
+
+    alarm = make_alarm()
+    simulation.run(alarm.run, 120)
+
+    assert replugged[0].lines[0].startswith("170.0")
+
+
+@pytest.mark.parametrize("defer_init", [False, True])
+def test_a_display_replugged_while_frames_are_unchanged_is_redrawn(
+    simulation, make_alarm, defer_init
+):
+    # Nothing is written while the frame stays the same, so only probing
+    # notices the display was gone
+    simulation.add_sensor(Trace([(0, 160)]))
+    simulation.add_display()
+    replugged = _replug(simulation, 2, 5)
+
+    from lib import AE_AQM0802
+
+    alarm = make_alarm(
+        display=AE_AQM0802(clock_pin=17, data_pin=16, defer_init=defer_init)
+    )
+    simulation.run(alarm.run, 10)
+
+    assert replugged[0].lines == ["160.0 ID", "05:00 30"]
@@ -0,0 +1,55 @@
+import pytest
+
+_TICKS_PERIOD = 1 << 30
+
+
+class _FakeClock:
+    # MicroPython-style ticks that the test moves by hand, wrapping like the
+    # real ones
+    def __init__(self, now_ms: int = 0) -> None:
+        self.now_ms = now_ms
+
+    def ticks_ms(self) -> int:
+        return self.now_ms % _TICKS_PERIOD
+
+    def ticks_diff(self, end: int, start: int) -> int:
+        return (end - start + _TICKS_PERIOD // 2) % _TICKS_PERIOD - _TICKS_PERIOD // 2
+
+
+def test_updates_count_the_time_that_actually_passed(simulation):
+    from loitering_monitor import LoiteringMonitor
+
+    # Starts just short of the wrap, so the first steps cross it
+    clock = _FakeClock(_TICKS_PERIOD - 700)
+    monitor = LoiteringMonitor(
+        alert_after_seconds=10, timeout_seconds=5, resolution=0.5, clock=clock
+    )
+
+    monitor.update(True)
+    assert monitor.state == "detected"
+    # The first update has nothing to measure from
+    assert monitor.elapsed_time == 0
+    assert monitor.drift == 0
+
+    for late_ms in (0, 300, 0, 1200, 0):
+        clock.now_ms += 500 + late_ms
+        monitor.update(True)
+    assert monitor.elapsed_time == pytest.approx(4.0)
+    assert monitor.drift == 0
+    assert monitor.max_drift == pytest.approx(1.2)
+
+    # A stall long enough to reach the alert counts in full
+    clock.now_ms += 6_000
+    monitor.update(True)
+    assert monitor.state == "alarm"
+    assert monitor.drift == pytest.approx(5.5)
+    assert monitor.max_drift == pytest.approx(5.5)
+
+    clock.now_ms += 400
+    monitor.update(False)
+    assert monitor.state == "armed"
+    assert monitor.drift == pytest.approx(-0.1)
+    clock.now_ms += 5_000
+    monitor.update(False)
+    assert monitor.occluded_time == pytest.approx(5.0)
+    assert monitor.state == "idle"
@@ -0,0 +1,86 @@
+import pytest
+
+from host import Simulation, Trace
+from host.simulator import unload_firmware
+from host.testing import build_alarm
+
+
+def _simulate(mode: str) -> list:
+    unload_firmware()
+    with Simulation() as simulation:
+        simulation.add_sensor(
+            Trace.visit(arrive_s=5, leave_s=60, distance_cm=100, background_cm=160)
+        )
+        simulation.add_display()
+
+        from loitering_monitor import LoiteringMonitor
+
+        monitor = LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10)
+        alarm = build_alarm(monitor=monitor)
+        target = alarm.run if mode == "sync" else alarm.run_async
+        return simulation.run(target, 100, monitor=monitor)
+
+
+def test_run_async_matches_run():
+    expected = _simulate("sync")
+    actual = _simulate("async")
+
+    assert [step.state for step in expected] == [
+        "idle",
+        "detected",
+        "alarm",
+        "armed",
+        "idle",
+    ]
+    assert [step.state for step in actual] == [step.state for step in expected]
+    for got, want in zip(actual, expected):
+        # Both sample at the monitor's resolution; only write timing differs
+        assert abs(got.time_s - want.time_s) <= 0.5
+
+
+def test_alarm_pattern_plays_until_the_reset(simulation, make_alarm):
+    simulation.add_sensor(
+        Trace.visit(arrive_s=5, leave_s=60, distance_cm=100, background_cm=160)
+    )
+    simulation.add_display()
+
+    from loitering_monitor import LoiteringMonitor
+
+    monitor = LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10)
+    alarm = make_alarm(monitor=monitor)
+    playing = {}
+
+    def check() -> None:
+        playing[monitor.state] = alarm.sequencer.is_playing
+
+    # As before the sequencer, the buzzer sounds on while the target is
+    # out of sight and stops once the timeout resets the monitor
+    for time_s in (40, 65, 75):
+        simulation.clock.schedule(time_s * 1_000_000, check)
+    simulation.run(alarm.run, 80)
+
+    assert playing == {"alarm": True, "armed": True, "idle": False}
+    assert not alarm.buzzer.is_on
+
+
+def test_alarm_and_reset_land_on_their_deadlines(simulation, make_alarm):
+    # Odd times, so neither deadline falls on a sample
+    simulation.add_sensor(
+        Trace.visit(arrive_s=5.23, leave_s=60.11, distance_cm=100, background_cm=160)
+    )
+    simulation.add_display()
+
+    import time
+
+    from loitering_monitor import LoiteringMonitor
+
+    monitor = LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10, clock=time)
+    alarm = make_alarm(monitor=monitor)
+    timeline = simulation.run(alarm.run, 100, monitor=monitor)
+    times = {step.state: step.time_s for step in timeline[1:]}
+
+    assert list(times) == ["detected", "alarm", "armed", "idle"]
+    # To the millisecond, where waiting for the next sample would be up to a
+    # whole period late
+    assert times["alarm"] - times["detected"] == pytest.approx(20, abs=0.001)
+    assert times["idle"] - times["armed"] == pytest.approx(10, abs=0.001)
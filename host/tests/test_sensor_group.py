@@ -0,0 +1,131 @@
+import pytest
+
+
+class FakeSensor:
+    def __init__(self, clock, distance: float | None, echo_timeout_us: int) -> None:
+        self.clock = clock
+        self.value = distance
+        self.echo_timeout_us = echo_timeout_us
+        self.pinged_at_us: list[int] = []
+
+    @property
+    def distance(self) -> float | None:
+        self.pinged_at_us.append(self.clock.now_us)
+        return self.value
+
+
+@pytest.fixture
+def sensors(simulation):
+    return [
+        FakeSensor(simulation.clock, 100, echo_timeout_us=10_000),
+        FakeSensor(simulation.clock, 200, echo_timeout_us=20_000),
+        FakeSensor(simulation.clock, 300, echo_timeout_us=10_000),
+    ]
+
+
+def test_triggers_round_robin(sensors):
+    from lib import SensorGroup
+
+    group = SensorGroup(sensors)
+    readings = [group.distance for _ in range(6)]
+    assert readings == [100, 200, 300, 100, 200, 300]
+    assert [len(sensor.pinged_at_us) for sensor in sensors] == [2, 2, 2]
+
+
+def test_spaces_triggers_by_the_previous_sensors_timeout(simulation, sensors):
+    from lib import SensorGroup
+
+    group = SensorGroup(sensors, guard_us=5_000)
+    for _ in range(6):
+        group.distance
+
+    times = sorted(
+        (at_us, index)
+        for index, sensor in enumerate(sensors)
+        for at_us in sensor.pinged_at_us
+    )
+    for (previous_us, index), (at_us, _) in zip(times, times[1:]):
+        # Echoes of the previous ping must have died out, and no more
+        assert at_us - previous_us == sensors[index].echo_timeout_us + 5_000
+
+
+def test_interval_limits(sensors):
+    from lib import SensorGroup
+
+    group = SensorGroup(sensors, guard_us=5_000)
+    assert group.min_interval_us == 25_000
+    assert group.cycle_us == 15_000 + 25_000 + 15_000
+
+
+def test_does_not_wait_when_the_caller_is_slower(simulation, sensors):
+    from lib import SensorGroup
+
+    group = SensorGroup(sensors)
+    group.distance
+    simulation.clock.advance(100_000)
+    started_us = simulation.clock.now_us
+    group.distance
+    assert sensors[1].pinged_at_us == [started_us]
+
+
+def _zones(sensors):
+    from loitering_monitor import LoiteringMonitor, MultiZoneMonitor
+
+    from lib import SensorGroup
+
+    group = SensorGroup(sensors, guard_us=5_000)
+    monitors = [
+        LoiteringMonitor(alert_after_seconds=4, timeout_seconds=2, leeway_seconds=0)
+        for _ in sensors
+    ]
+    return group, monitors, MultiZoneMonitor(group, monitors)
+
+
+def test_readings_update_only_their_own_zone(sensors):
+    group, monitors, zones = _zones(sensors)
+
+    group.distance
+    zones.update(True, elapsed=0.5)
+    assert [monitor.state for monitor in monitors] == ["detected", "idle", "idle"]
+
+    group.distance
+    zones.update(False, elapsed=0.5)
+    assert [monitor.state for monitor in monitors] == ["detected", "idle", "idle"]
+
+
+def test_each_zone_is_credited_the_time_since_its_last_visit(sensors):
+    group, monitors, zones = _zones(sensors)
+
+    for _ in range(6):
+        group.distance
+        zones.update(True, elapsed=0.5)
+
+    # Two visits each, the second crediting a full round of three updates
+    assert [monitor.elapsed_time for monitor in monitors] == [1.5, 1.5, 1.5]
+
+
+def test_most_urgent_zone_drives_the_outputs(sensors):
+    group, monitors, zones = _zones(sensors)
+
+    for _ in range(12):
+        group.distance
+        # Only the middle zone sees someone
+        zones.update(group.index == 1, elapsed=0.5)
+
+    assert monitors[1].state == "alarm"
+    assert zones.zone is monitors[1]
+    assert zones.state == "alarm"
+    assert zones.time_to_alert == 0
+
+
+def test_resolution_is_bounded_by_crosstalk(sensors):
+    _, _, zones = _zones(sensors)
+    # 0.5 s shared by three zones, but never faster than the slowest spacing
+    assert zones.resolution == pytest.approx(0.5 / 3)
+
+    from loitering_monitor import LoiteringMonitor, MultiZoneMonitor
+
+    from lib import SensorGroup
+
+    fast = [LoiteringMonitor(resolution=0.01) for _ in sensors]
+    assert MultiZoneMonitor(SensorGroup(sensors), fast).resolution == 0.035
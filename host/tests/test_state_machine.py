@@ -0,0 +1,42 @@
+from host.testing import visit_events
+
+
+def test_compiled_machine_follows_the_plain_one(simulation):
+    from states import EVENTS, STATES, TRANSITIONS, State
+
+    from lib import CompiledStateMachine, StateMachine
+
+    def compiled() -> CompiledStateMachine:
+        return CompiledStateMachine(
+            State.IDLE, TRANSITIONS, states=STATES, events=EVENTS
+        )
+
+    plain = StateMachine(State.IDLE, TRANSITIONS)
+    by_name = compiled()
+    by_id = compiled()
+
+    assert by_name.transitions is TRANSITIONS
+    for event in visit_events() + ["no such event"]:
+        expected = plain.transition(event)
+        assert by_name.transition(event) == expected
+        if event in EVENTS:
+            assert by_id.transition_id(by_id.event_id_of(event)) == expected
+        assert by_name.state == by_id.state == plain.state
+        assert by_name.state_id == STATES.index(plain.state)
+
+
+def test_assigning_the_state_moves_the_transition_row(simulation):
+    from states import EVENTS, STATES, TRANSITIONS, Event, State
+
+    from lib import CompiledStateMachine
+
+    fsm = CompiledStateMachine(State.IDLE, TRANSITIONS, states=STATES, events=EVENTS)
+    fsm.state = State.ALARM
+
+    assert fsm.state_id == STATES.index(State.ALARM)
+    # IDLE has no transition on this event, ALARM does
+    assert fsm.transition(Event.TARGET_OUT_OF_RANGE)
+    assert fsm.state == State.ARMED
+    fsm.state = State.DETECTED
+    assert fsm.transition_id(fsm.event_id_of(Event.ALERT_TIME_REACHED))
+    assert fsm.state == State.ALARM
@@ -0,0 +1,136 @@
+import fcntl
+import gc
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+from host import heap
+from host.telemetry import Decoder
+
+
+class _Sink:
+    # Stands in for sys.stdout, discarding what is written without keeping it
+    def __init__(self) -> None:
+        self.buffer = self
+
+    def write(self, data) -> int:
+        return len(data)
+
+
+def _heap_growth(simulation, alarm, distances: list, iterations: int) -> int:
+    def loop() -> None:
+        for index in range(iterations):
+            simulation.clock.advance(100_000)
+            distance = distances[index % len(distances)]
+            alarm.monitor.update(distance < 150, 0.1)
+            alarm._write_data(distance)
+
+    loop()
+    gc.collect()
+    heap.reset()
+    loop()
+    gc.collect()
+    return gc.mem_alloc()
+
+
+def test_writing_telemetry_does_not_grow_the_heap(
+    simulation, make_alarm, monkeypatch
+):
+    simulation.add_display()
+    monkeypatch.setattr(sys, "stdout", _Sink())
+
+    from loitering_monitor import LoiteringMonitor
+
+    from lib import DistanceSensor
+
+    alarm = make_alarm(
+        distance_sensor=DistanceSensor(),
+        monitor=LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10),
+        debug=True,
+    )
+    # A target wandering in and out of range, so every field changes
+    distances = [100 + index * 1.37 % 80 for index in range(64)]
+
+    tracemalloc.start()
+    try:
+        assert _heap_growth(simulation, alarm, distances, 500) <= 64
+        assert _heap_growth(simulation, alarm, distances, 2_000) <= 64
+    finally:
+        tracemalloc.stop()
+
+
+def _status(state: str, distance: float, alert_s: float, reset_s: float):
+    # As LoiteringAlarm writes it, with 0 for no reading
+    return {
+        "distance": distance,
+        "state": state,
+        "time_to_alert": alert_s,
+        "time_to_reset": reset_s,
+    }
+
+
+def test_frames_decode_on_the_host(simulation):
+    from telemetry import FrameFormatter
+
+    formatter = FrameFormatter()
+    # Crosses the wrap of the 16-bit sequence number
+    formatter.sequence = 0xFFFE
+    statuses = [
+        _status("idle", 0, 300, 30),
+        _status("detected", 123.4, 299.5, 30),
+        _status("alarm", 87.6, 0, 30),
+        _status("armed", 0, 0, 12.25),
+    ]
+    frames = [bytes(formatter(status)) for status in statuses]
+    corrupted = bytearray(frames[2])
+    corrupted[8] ^= 0x01
+
+    decoder = Decoder()
+    # Noise before the first frame, a corrupted copy, and a stream split
+    # mid-frame
+    stream = b"\x00\xa5" + frames[0] + frames[1] + bytes(corrupted) + frames[2]
+    decoded = decoder.feed(stream[:30]) + decoder.feed(stream[30:] + frames[3])
+
+    assert [frame.sequence for frame in decoded] == [0xFFFE, 0xFFFF, 0, 1]
+    assert [frame.state for frame in decoded] == ["idle", "detected", "alarm", "armed"]
+    assert [frame.distance_cm for frame in decoded] == [None, 123.4, 87.6, None]
+    assert [frame.time_to_alert_s for frame in decoded] == [300, 299.5, 0, 0]
+    assert [frame.time_to_reset_s for frame in decoded] == [30, 30, 30, 12.25]
+    assert decoder.crc_errors >= 1
+    assert decoder.lost == 0
+
+
+def test_a_full_ring_drops_the_newest_frames(simulation):
+    from telemetry import FrameFormatter, FrameRing
+
+    read_fd, write_fd = os.pipe()
+    fcntl.fcntl(write_fd, fcntl.F_SETFL, os.O_NONBLOCK)
+    with os.fdopen(read_fd, "rb") as host, os.fdopen(write_fd, "wb", 0) as port:
+        # A host that stopped reading: the pipe is full, so polling says
+        # the port would block
+        filler = 0
+        with pytest.raises(BlockingIOError):
+            while True:
+                filler += os.write(write_fd, b"\xff" * 4096)
+
+        formatter = FrameFormatter()
+        ring = FrameRing(capacity=4, stream=port)
+        for index in range(10):
+            ring.write(formatter(_status("detected", 100 + index, 300, 30)))
+        assert (len(ring), ring.sent, ring.dropped) == (4, 0, 6)
+
+        # Reading again lets the queued frames through, oldest first
+        host.read(filler)
+        ring.drain()
+        ring.write(formatter(_status("detected", 110, 300, 30)))
+        assert (len(ring), ring.sent) == (0, 5)
+        port.close()
+
+        decoder = Decoder()
+        frames = decoder.feed(host.read())
+    assert [frame.sequence for frame in frames] == [0, 1, 2, 3, 10]
+    assert [frame.distance_cm for frame in frames] == [100, 101, 102, 103, 110]
+    # The host sees the drops as a gap in the sequence
+    assert decoder.lost == ring.dropped
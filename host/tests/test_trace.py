@@ -0,0 +1,113 @@
+import pytest
+
+from host import Trace
+
+
+def _replay_all(replay) -> list:
+    readings = []
+    try:
+        while True:
+            readings.append(replay.distance)
+    except EOFError:
+        return readings
+
+
+def test_a_new_recorder_keeps_earlier_sessions(simulation, tmp_path):
+    from lib import TraceRecorder, TraceReplay
+
+    path = str(tmp_path / "trace.bin")
+    first = TraceRecorder(path)
+    first.record_sample(100.0)
+    first.flush()
+    second = TraceRecorder(path)
+    second.record_sample(50.0)
+    second.record_sample(None)
+    second.flush()
+
+    assert _replay_all(TraceReplay(path)) == [100.0, 50.0, None]
+    assert _replay_all(TraceReplay(path, session=0)) == [100.0]
+    assert _replay_all(TraceReplay(path, session=1)) == [50.0, None]
+
+
+def test_a_full_recording_is_rotated(simulation, tmp_path):
+    from lib import TraceRecorder, TraceReplay
+
+    path = str(tmp_path / "trace.bin")
+    first = TraceRecorder(path)
+    for _ in range(10):
+        first.record_sample(100.0)
+    first.flush()
+    TraceRecorder(path, max_bytes=64).flush()
+
+    assert _replay_all(TraceReplay(path)) == []
+    assert len(_replay_all(TraceReplay(path + ".old"))) == 10
+
+
+def test_a_partial_record_is_not_replayed(simulation, tmp_path):
+    from lib import TraceRecorder, TraceReplay
+
+    path = str(tmp_path / "trace.bin")
+    recorder = TraceRecorder(path, block_records=4)
+    for distance in (100.0, 90.0, 80.0):
+        recorder.record_sample(distance)
+    recorder.flush()
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x00")
+
+    # A refill of the block-sized buffer must not reuse its stale tail
+    assert _replay_all(TraceReplay(path, block_records=4)) == [100.0, 90.0, 80.0]
+
+    # Recording resumes on a record boundary after the cut-short one
+    recorder = TraceRecorder(path)
+    recorder.record_sample(70.0)
+    recorder.flush()
+    assert _replay_all(TraceReplay(path, session=1)) == [70.0]
+
+
+def test_stop_flushes_the_recording(simulation, make_alarm, tmp_path):
+    simulation.add_sensor(Trace([(0, 100)]))
+    simulation.add_display()
+
+    from lib import TraceRecorder, TraceReplay
+
+    path = str(tmp_path / "trace.bin")
+    alarm = make_alarm(recorder=TraceRecorder(path, block_records=64))
+    simulation.clock.schedule(2_000_000, alarm.stop)
+    simulation.run(alarm.run, 10)
+
+    readings = _replay_all(TraceReplay(path))
+    assert readings
+    assert readings[-1] == pytest.approx(100, abs=1)
+
+
+def test_replay_reproduces_the_recorded_transitions(simulation, make_alarm, tmp_path):
+    simulation.add_sensor(
+        Trace.visit(arrive_s=5, leave_s=60, distance_cm=100, background_cm=160)
+    )
+    simulation.add_display()
+
+    import time
+
+    from loitering_monitor import LoiteringMonitor
+    from replay import replay
+
+    from lib import TraceRecorder, TraceReplay
+
+    path = str(tmp_path / "trace.bin")
+    monitor = LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10, clock=time)
+    alarm = make_alarm(monitor=monitor, recorder=TraceRecorder(path))
+    simulation.clock.schedule(100_000_000, alarm.stop)
+    recorded = simulation.run(alarm.run, 120, monitor=monitor)
+
+    source = TraceReplay(path)
+    replayed = replay(
+        source,
+        LoiteringMonitor(alert_after_seconds=20, timeout_seconds=10, clock=source),
+    )
+
+    assert [state for _, state in replayed] == [step.state for step in recorded]
+    for (ticks_ms, _), step in zip(replayed[1:], recorded[1:]):
+        # Replay only sees the samples, so timers fire at the next one;
+        # ticks are whole milliseconds
+        late_s = ticks_ms / 1000 - step.time_s
+        assert -0.001 <= late_s <= monitor.resolution + 0.1
@@ -0,0 +1,66 @@
+import pytest
+
+
+def _data(distance: float, state: str = "detected") -> dict:
+    return {
+        "distance": distance,
+        "state": state,
+        "time_to_alert": 300,
+        "time_to_reset": 30,
+    }
+
+
+def _policy(**options):
+    from writers import LCDFormatter, Writer, WriterPolicy
+
+    written = []
+    writer = Writer(lambda output: written.append(bytes(output)), LCDFormatter())
+    return WriterPolicy(writer, **options), written
+
+
+def test_max_rate_throttles_writes(simulation):
+    policy, written = _policy(max_rate_hz=2)
+
+    for index in range(20):
+        policy.write(_data(100 + index))
+        simulation.clock.advance(100_000)
+
+    # One every 500 ms: at 0, 0.5, 1.0 and 1.5 s
+    assert [output[:5] for output in written] == [
+        b"100.0",
+        b"105.0",
+        b"110.0",
+        b"115.0",
+    ]
+    assert (policy.emitted, policy.suppressed) == (4, 16)
+
+
+@pytest.mark.parametrize("refresh_on_state_change", [True, False])
+def test_a_state_change_can_override_throttling(simulation, refresh_on_state_change):
+    policy, written = _policy(
+        max_rate_hz=1, refresh_on_state_change=refresh_on_state_change
+    )
+
+    policy.write(_data(100))
+    simulation.clock.advance(100_000)
+    emitted = policy.write(_data(100, "alarm"))
+
+    assert emitted is refresh_on_state_change
+    assert written[-1][6:8] == (b"AL" if refresh_on_state_change else b"DE")
+    assert policy.emitted + policy.suppressed == 2
+
+
+def test_unchanged_output_is_skipped(simulation):
+    policy, written = _policy(skip_unchanged=True)
+
+    for distance in (100, 100, 100.01, 120, 120):
+        policy.write(_data(distance))
+
+    # 100.01 renders the same as 100.0
+    assert [output[:5] for output in written] == [b"100.0", b"120.0"]
+    assert (policy.emitted, policy.suppressed) == (2, 3)
+
+
+def test_the_rate_must_be_positive(simulation):
+    with pytest.raises(ValueError):
+        _policy(max_rate_hz=0)
@@ -0,0 +1,17 @@
+# Stand-in for the MicroPython _thread module. The second core is a thread
+# that takes turns with the first on the virtual clock, so a dual-core run
+# is as deterministic as a single-core one.
+import _thread
+
+from . import machine
+
+allocate_lock = _thread.allocate_lock
+get_ident = _thread.get_ident
+
+
+def start_new_thread(function, args: tuple) -> None:
+    machine.world.clock.start_thread(function, args)
+
+
+def __getattr__(name: str):
+    return getattr(_thread, name)
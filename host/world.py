@@ -0,0 +1,50 @@
+import errno
+
+from .clock import VirtualClock
+
+
+class PinState:
+    def __init__(self, pin_id) -> None:
+        self.pin_id = pin_id
+        self.value = 0
+        self.listeners: list = []
+        self.irq_handler = None
+        self.irq_trigger = 0
+        self.irq_pin = None
+
+    def set(self, value: int) -> None:
+        value = 1 if value else 0
+        if value == self.value:
+            return
+
+        self.value = value
+        for listener in self.listeners:
+            listener(value)
+
+        # Mirrors machine.Pin.IRQ_FALLING (4) and machine.Pin.IRQ_RISING (8)
+        edge = 8 if value else 4
+        if self.irq_handler is not None and self.irq_trigger & edge:
+            self.irq_handler(self.irq_pin)
+
+
+class World:
+    def __init__(self, clock: VirtualClock | None = None) -> None:
+        self.clock = VirtualClock() if clock is None else clock
+        self.pins: dict = {}
+        self.i2c_devices: dict = {}
+        self.i2c_transactions = 0
+        self.i2c_bytes = 0
+
+    def pin(self, pin_id) -> PinState:
+        if pin_id not in self.pins:
+            self.pins[pin_id] = PinState(pin_id)
+        return self.pins[pin_id]
+
+    def i2c_write(self, addr: int, data: bytes) -> None:
+        if addr not in self.i2c_devices:
+            raise OSError(errno.EIO, "I2C device not acknowledging")
+
+        self.i2c_transactions += 1
+        self.i2c_bytes += len(data)
+        if data:
+            self.i2c_devices[addr].write(data)
@@ -1,3 +1,5 @@
+from machine import Timer
+
 from lib import Pin
 
 
@@ -9,6 +11,7 @@ class LEDController:
         freq_occluded: float = 10,
         freq_alarm: float | None = None,
         freq_armed: float | None = None,
+        timer_id: int = -1,
     ):
         self.led = Pin(pin_number, Pin.OUT)
         self.freq_detected = freq_detected
@@ -22,17 +25,39 @@ class LEDController:
             freq_armed = freq_occluded
         self.freq_armed = freq_armed
 
+        self._timer = Timer(timer_id)
+        self._toggle = self._on_timer
+        self._frequency: float | None = None
+
     def on(self):
+        self.flash(None)
         self.led.on()
 
-    def flash_detected(self, duration: float) -> None:
-        self.led.pulse(self.freq_detected, duration)
+    def flash(self, frequency: float | None) -> None:
+        if frequency == self._frequency:
+            return
+
+        self._timer.deinit()
+        self._frequency = frequency
+        if frequency is not None:
+            # Two toggles per flash period
+            self._timer.init(
+                mode=Timer.PERIODIC,
+                freq=2 * frequency,
+                callback=self._toggle,
+            )
+
+    def flash_detected(self) -> None:
+        self.flash(self.freq_detected)
+
+    def flash_occluded(self) -> None:
+        self.flash(self.freq_occluded)
 
-    def flash_occluded(self, duration: float) -> None:
-        self.led.pulse(self.freq_occluded, duration)
+    def flash_alarm(self) -> None:
+        self.flash(self.freq_detected)
 
-    def flash_alarm(self, duration: float) -> None:
-        self.led.pulse(self.freq_detected, duration)
+    def flash_armed(self) -> None:
+        self.flash(self.freq_armed)
 
-    def flash_armed(self, duration: float) -> None:
-        self.led.pulse(self.freq_armed, duration)
+    def _on_timer(self, timer) -> None:
+        self.led.toggle()
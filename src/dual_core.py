@@ -0,0 +1,81 @@
+import _thread
+from array import array
+
+from states import STATES, State
+
+
+class Snapshot:
+    # The consumer's copy of the latest published monitor state. It has the
+    # same attributes as LoiteringMonitor, so either can drive the outputs.
+    def __init__(self) -> None:
+        self.distance: float | None = None
+        self.state = State.IDLE
+        self.time_to_alert = 0.0
+        self.time_to_reset = 0.0
+        self.elapsed_time = 0.0
+        self.sequence = 0
+
+
+class SnapshotRing:
+    # Single producer, single consumer. The lock is only held while copying
+    # a handful of numbers, so neither core waits for the other's I/O.
+    def __init__(self, capacity: int = 8) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._capacity = capacity
+        self._distance = array("f", [0] * capacity)
+        self._has_distance = bytearray(capacity)
+        self._state_id = bytearray(capacity)
+        self._time_to_alert = array("f", [0] * capacity)
+        self._time_to_reset = array("f", [0] * capacity)
+        self._elapsed_time = array("f", [0] * capacity)
+        self._head = 0
+        self._count = 0
+        self._lock = _thread.allocate_lock()
+
+        self.published = 0
+        self.overwritten = 0
+
+    def publish(self, distance: float | None, monitor) -> None:
+        with self._lock:
+            if self._count == self._capacity:
+                # The consumer only needs the newest state, so drop the oldest
+                self._head = (self._head + 1) % self._capacity
+                self._count -= 1
+                self.overwritten += 1
+
+            index = (self._head + self._count) % self._capacity
+            self._has_distance[index] = distance is not None
+            self._distance[index] = distance or 0
+            self._state_id[index] = STATES.index(monitor.state)
+            self._time_to_alert[index] = monitor.time_to_alert
+            self._time_to_reset[index] = monitor.time_to_reset
+            self._elapsed_time[index] = monitor.elapsed_time
+            self._count += 1
+            self.published += 1
+
+    def take_latest(self, snapshot: Snapshot) -> int:
+        # Copies the newest entry into `snapshot` and discards the rest,
+        # returning how many entries there were
+        with self._lock:
+            count = self._count
+            if not count:
+                return 0
+
+            index = (self._head + count - 1) % self._capacity
+            if self._has_distance[index]:
+                snapshot.distance = self._distance[index]
+            else:
+                snapshot.distance = None
+            snapshot.state = STATES[self._state_id[index]]
+            snapshot.time_to_alert = self._time_to_alert[index]
+            snapshot.time_to_reset = self._time_to_reset[index]
+            snapshot.elapsed_time = self._elapsed_time[index]
+            snapshot.sequence = self.published
+            self._head = (self._head + count) % self._capacity
+            self._count = 0
+            return count
+
+    def __len__(self) -> int:
+        return self._count
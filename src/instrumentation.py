@@ -0,0 +1,176 @@
+import gc
+import select
+import sys
+import time
+from array import array
+
+from stages import Stage
+
+
+class DebugConsole:
+    # Non-blocking read of keys sent over the serial console. Shared by all
+    # instruments so they do not consume each other's keys.
+    def __init__(self) -> None:
+        self._poll = select.poll()
+        self._poll.register(sys.stdin, select.POLLIN)
+
+    def read(self) -> str:
+        keys = ""
+        while self._poll.poll(0):
+            key = sys.stdin.read(1)
+            if not key:
+                # End of input keeps polling as readable
+                break
+            keys += key
+        return keys
+
+
+class LoopProfiler:
+    # Bucket i counts durations below 64 << i us; the last one catches the rest
+    BUCKETS = 16
+    _FIRST_EDGE_US = 64
+
+    def __init__(self, stages: int = Stage.WRITER + 3, dump_key: str | None = "p"):
+        self.stages = stages
+        self.dump_key = dump_key
+        self._counts = array("I", [0] * (stages * self.BUCKETS))
+        self._calls = array("I", [0] * stages)
+        # Totals in whole milliseconds plus the microseconds left over; in
+        # microseconds alone they would wrap after 71 minutes of one stage
+        self._total_ms = array("I", [0] * stages)
+        self._total_us = array("I", [0] * stages)
+        self._max_us = array("I", [0] * stages)
+        self._reference_us = time.ticks_us()
+
+    def start(self) -> None:
+        self._reference_us = time.ticks_us()
+
+    def mark(self, stage: int) -> None:
+        now = time.ticks_us()
+        duration = time.ticks_diff(now, self._reference_us)
+        self._reference_us = now
+        if stage >= self.stages:
+            return
+
+        bucket = 0
+        edge = self._FIRST_EDGE_US
+        while duration >= edge and bucket < self.BUCKETS - 1:
+            bucket += 1
+            edge <<= 1
+
+        self._counts[stage * self.BUCKETS + bucket] += 1
+        self._calls[stage] += 1
+        total_us = self._total_us[stage] + duration
+        self._total_ms[stage] += total_us // 1000
+        self._total_us[stage] = total_us % 1000
+        if duration > self._max_us[stage]:
+            self._max_us[stage] = duration
+
+    def finish(self, keys: str = "") -> None:
+        if self.dump_key and self.dump_key in keys:
+            self.dump()
+
+    def dump(self, write=print, reset: bool = True) -> None:
+        write(f"{'stage':<10} {'count':>7} {'mean_us':>8} {'max_us':>8}  histogram")
+        for stage in range(self.stages):
+            calls = self._calls[stage]
+            if not calls:
+                continue
+            start = stage * self.BUCKETS
+            histogram = " ".join(
+                str(self._counts[start + bucket]) for bucket in range(self.BUCKETS)
+            )
+            mean_us = (self._total_ms[stage] * 1000 + self._total_us[stage]) // calls
+            write(
+                f"{Stage.name(stage):<10} {calls:>7} "
+                f"{mean_us:>8} {self._max_us[stage]:>8}  "
+                f"{histogram}"
+            )
+        if reset:
+            self.reset()
+
+    def reset(self) -> None:
+        for values in (
+            self._counts,
+            self._calls,
+            self._total_ms,
+            self._total_us,
+            self._max_us,
+        ):
+            for index in range(len(values)):
+                values[index] = 0
+
+
+class MemoryMonitor:
+    def __init__(
+        self,
+        stages: int = Stage.WRITER + 3,
+        *,
+        threshold: int | None = None,
+        collect_each_loop: bool = False,
+        dump_key: str | None = "m",
+    ):
+        # Collecting at the end of every loop, after the display write, keeps
+        # automatic collections from landing in the middle of a stage.
+        if threshold is not None:
+            gc.threshold(threshold)
+
+        self.stages = stages
+        self.collect_each_loop = collect_each_loop
+        self.dump_key = dump_key
+
+        self._low_water = array("I", [0] * stages)
+        self._last_free = gc.mem_free()
+        self.collections = 0
+        self.automatic_collections = 0
+        self.max_collect_us = 0
+        self.reset()
+
+    def start(self) -> None:
+        self._observe(gc.mem_free())
+
+    def mark(self, stage: int) -> None:
+        free = gc.mem_free()
+        self._observe(free)
+        if stage < self.stages and free < self._low_water[stage]:
+            self._low_water[stage] = free
+
+    def _observe(self, free: int) -> None:
+        # The heap only shrinks between collections, so growth means one ran
+        if free > self._last_free:
+            self.automatic_collections += 1
+        self._last_free = free
+
+    def finish(self, keys: str = "") -> None:
+        if self.collect_each_loop:
+            start = time.ticks_us()
+            gc.collect()
+            duration = time.ticks_diff(time.ticks_us(), start)
+            self.collections += 1
+            if duration > self.max_collect_us:
+                self.max_collect_us = duration
+            self._last_free = gc.mem_free()
+
+        if self.dump_key and self.dump_key in keys:
+            self.dump()
+
+    def dump(self, write=print, reset: bool = True) -> None:
+        write(
+            f"free {gc.mem_free()} B, allocated {gc.mem_alloc()} B, "
+            f"collections {self.collections} explicit "
+            f"(max {self.max_collect_us} us), "
+            f"{self.automatic_collections} automatic"
+        )
+        write(f"{'stage':<10} {'low_free':>9}")
+        for stage in range(self.stages):
+            if self._low_water[stage] != 0xFFFFFFFF:
+                write(f"{Stage.name(stage):<10} {self._low_water[stage]:>9}")
+        if reset:
+            self.reset()
+
+    def reset(self) -> None:
+        for index in range(len(self._low_water)):
+            self._low_water[index] = 0xFFFFFFFF
+        self.collections = 0
+        self.automatic_collections = 0
+        self.max_collect_us = 0
@@ -1,18 +1,67 @@
-from .buzzer import Buzzer, Pulse
-from .distance import HC_SR04, DistanceSensor
-from .lcd import AE_AQM0802, LCD
-from .tools import scan_i2c_devices
-from .utils import PWM, Pin, StateMachine
+# Submodules are imported on first attribute access so that a script only
+# pays for the drivers it actually uses.
+_EXPORTS = {
+    "AE_AQM0802": "lcd",
+    "BurstDistanceSensor": "distance.burst",
+    "BurstReading": "distance.burst",
+    "Buzzer": "buzzer",
+    "BuzzerSequencer": "buzzer",
+    "CompiledStateMachine": "utils",
+    "DistanceSensor": "distance",
+    "EMAFilter": "distance.filters",
+    "FilteredDistanceSensor": "distance.filters",
+    "HC_SR04": "distance",
+    "HC_SR04_IRQ": "distance",
+    # Only on ports with the rp2 module, so not part of lib.distance
+    "HC_SR04_PIO": "distance.hc_sr04_pio",
+    "LCD": "lcd",
+    "MedianFilter": "distance.filters",
+    "OutlierFilter": "distance.filters",
+    "PWM": "utils",
+    "Pattern": "buzzer",
+    "Pin": "utils",
+    "Pulse": "buzzer",
+    "SensorGroup": "distance.group",
+    "StateMachine": "utils",
+    "TraceRecorder": "trace",
+    "TraceReplay": "trace",
+    "scan_i2c_devices": "tools",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    module = __import__("lib." + module_name, None, None, [name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AE_AQM0802",
+    "BurstDistanceSensor",
+    "BurstReading",
     "DistanceSensor",
+    "EMAFilter",
+    "FilteredDistanceSensor",
     "HC_SR04",
+    "HC_SR04_IRQ",
+    "HC_SR04_PIO",
     "Buzzer",
+    "BuzzerSequencer",
+    "CompiledStateMachine",
     "LCD",
+    "MedianFilter",
+    "OutlierFilter",
     "PWM",
+    "Pattern",
     "Pin",
     "Pulse",
+    "SensorGroup",
     "StateMachine",
+    "TraceRecorder",
+    "TraceReplay",
     "scan_i2c_devices",
 ]
@@ -1,6 +1,9 @@
 from .buzzer import Buzzer, Pulse
+from .sequencer import BuzzerSequencer, Pattern
 
 __all__ = [
     "Buzzer",
+    "BuzzerSequencer",
+    "Pattern",
     "Pulse",
 ]
@@ -37,6 +37,7 @@ class Buzzer:
         duty_cycle: float = 0.5,
     ) -> None:
         self._is_active = is_active
+        self.duty_cycle = duty_cycle
 
         self.hardware: Pin | PWM
         if self.is_active:
@@ -50,6 +51,15 @@ class Buzzer:
     def off(self) -> None:
         self.hardware.off()
 
+    def tone(self, freq: int, duty_u16: int) -> None:
+        # Raw values for timer callbacks; a freq of 0 keeps the current one
+        if self.is_active:
+            self.hardware.value = 1 if duty_u16 else 0
+            return
+        if freq and freq != self.hardware.freq:
+            self.hardware.freq = freq
+        self.hardware.duty_u16(duty_u16)
+
     @property
     def is_active(self) -> bool:
         return self._is_active
@@ -0,0 +1,111 @@
+from array import array
+
+from machine import Timer
+
+from .buzzer import Buzzer, Pulse
+
+
+class Pattern:
+    def __init__(
+        self,
+        pulses: list[Pulse],
+        *,
+        duty_cycle: float = 0.5,
+        loop_from: int = 0,
+    ) -> None:
+        if not pulses:
+            raise ValueError("A pattern needs at least one pulse")
+        if not 0 <= loop_from < len(pulses):
+            raise ValueError("loop_from must index one of the pulses")
+
+        # One step per tone and one per rest; a frequency of 0 keeps the
+        # current one and a duty of 0 silences the buzzer.
+        self.freqs = array("H")
+        self.duties = array("H")
+        self.durations_ms = array("H")
+        self.loop_start = 0
+        for index, pulse in enumerate(pulses):
+            if index == loop_from:
+                self.loop_start = len(self.durations_ms)
+            if pulse.duty_cycle is None:
+                duty = duty_cycle
+            else:
+                duty = pulse.duty_cycle
+            self._append(pulse.freq or 0, int(65535 * duty), pulse.duration_ms)
+            if pulse.rest_ms:
+                self._append(0, 0, pulse.rest_ms)
+
+    def _append(self, freq: int, duty_u16: int, duration_ms: int) -> None:
+        if duration_ms > 0xFFFF:
+            raise ValueError("Steps are limited to 65535 ms")
+        self.freqs.append(freq)
+        self.duties.append(duty_u16)
+        self.durations_ms.append(duration_ms)
+
+    def __len__(self) -> int:
+        return len(self.durations_ms)
+
+
+class BuzzerSequencer:
+    def __init__(self, buzzer: Buzzer, *, timer_id: int = -1) -> None:
+        self.buzzer = buzzer
+        self._timer = Timer(timer_id)
+        self._advance = self._on_timer
+        self._pattern: Pattern | None = None
+        self._step = 0
+        self._repeats_left = 0
+
+    @property
+    def pattern(self) -> Pattern | None:
+        return self._pattern
+
+    @property
+    def is_playing(self) -> bool:
+        return self._pattern is not None
+
+    def play(self, pattern: Pattern, *, repeat: int = 1, restart: bool = False) -> None:
+        # repeat=0 loops until stopped, restarting at the pattern's loop_start
+        if pattern is self._pattern and not restart:
+            return
+
+        self._timer.deinit()
+        self._pattern = pattern
+        self._step = 0
+        self._repeats_left = repeat
+        self._next_step()
+
+    def stop(self) -> None:
+        self._timer.deinit()
+        self._pattern = None
+        self.buzzer.off()
+
+    def _on_timer(self, timer) -> None:
+        self._next_step()
+
+    def _next_step(self) -> None:
+        pattern = self._pattern
+        if pattern is None:
+            return
+
+        step = self._step
+        if step >= len(pattern):
+            if self._repeats_left == 1:
+                self.stop()
+                return
+            if self._repeats_left > 1:
+                self._repeats_left -= 1
+                step = 0
+            else:
+                step = pattern.loop_start
+        self._step = step + 1
+
+        duty_u16 = pattern.duties[step]
+        if duty_u16:
+            self.buzzer.tone(pattern.freqs[step], duty_u16)
+        else:
+            self.buzzer.off()
+        self._timer.init(
+            mode=Timer.ONE_SHOT,
+            period=pattern.durations_ms[step],
+            callback=self._advance,
+        )
@@ -1,7 +1,40 @@
 from .base import DistanceSensor
-from .hc_sr04 import HC_SR04
+from .hc_sr04 import HC_SR04, HC_SR04_IRQ
+
+# Filters, groups and bursts are imported on first attribute access, as in
+# lib, so the plain drivers do not pay for them.
+_EXPORTS = {
+    "BurstDistanceSensor": "burst",
+    "BurstReading": "burst",
+    "EMAFilter": "filters",
+    "Filter": "filters",
+    "FilteredDistanceSensor": "filters",
+    "MedianFilter": "filters",
+    "OutlierFilter": "filters",
+    "SensorGroup": "group",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    module = __import__("lib.distance." + module_name, None, None, [name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "BurstDistanceSensor",
+    "BurstReading",
     "DistanceSensor",
+    "EMAFilter",
+    "Filter",
+    "FilteredDistanceSensor",
     "HC_SR04",
+    "HC_SR04_IRQ",
+    "MedianFilter",
+    "OutlierFilter",
+    "SensorGroup",
 ]
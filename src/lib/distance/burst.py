@@ -0,0 +1,118 @@
+import time
+from array import array
+
+from .base import DistanceSensor
+
+
+class BurstReading:
+    def __init__(self) -> None:
+        self.distance: float | None = None
+        self.median = 0.0
+        self.trimmed_mean = 0.0
+        self.spread_cm = 0.0
+        self.valid = 0
+        self.valid_ratio = 0.0
+        self.confidence = 0.0
+
+
+class BurstDistanceSensor(DistanceSensor):
+    # Fires several pings per sample and aggregates them. Meant for sensors
+    # that block until their echo, such as HC_SR04; the IRQ and PIO variants
+    # would return the same reading repeatedly.
+    def __init__(
+        self,
+        sensor: DistanceSensor,
+        pings: int = 5,
+        *,
+        guard_us: int = 15_000,
+        trim: int = 1,
+        tolerance_cm: float = 10.0,
+        min_valid_ratio: float = 0.5,
+    ) -> None:
+        if pings <= 0:
+            raise ValueError("pings must be positive")
+        if guard_us < 0:
+            raise ValueError("guard_us cannot be negative")
+        if trim < 0:
+            raise ValueError("trim cannot be negative")
+        if tolerance_cm <= 0:
+            raise ValueError("tolerance_cm must be positive")
+        if not 0 <= min_valid_ratio <= 1:
+            raise ValueError("min_valid_ratio must be between 0 and 1")
+
+        self.sensor = sensor
+        self.pings = pings
+        self.trim = trim
+        self.tolerance_cm = tolerance_cm
+        self.min_valid_ratio = min_valid_ratio
+        # As in SensorGroup, echoes can arrive until the timeout has passed
+        self.spacing_us = getattr(sensor, "echo_timeout_us", 0) + guard_us
+
+        # Valid pings, kept sorted as they arrive
+        self._samples = array("f", [0] * pings)
+        self.reading = BurstReading()
+
+    @property
+    def distance(self) -> float | None:
+        return self.measure().distance
+
+    @property
+    def burst_us(self) -> int:
+        # Worst case, ignoring the time the last ping itself takes
+        return (self.pings - 1) * self.spacing_us
+
+    def measure(self) -> BurstReading:
+        samples = self._samples
+        valid = 0
+        started_us = 0
+        for ping in range(self.pings):
+            if ping:
+                wait_us = self.spacing_us - time.ticks_diff(time.ticks_us(), started_us)
+                if wait_us > 0:
+                    time.sleep_us(wait_us)
+            started_us = time.ticks_us()
+
+            distance = self.sensor.distance
+            if distance is None:
+                continue
+            index = valid
+            while index > 0 and samples[index - 1] > distance:
+                samples[index] = samples[index - 1]
+                index -= 1
+            samples[index] = distance
+            valid += 1
+
+        return self._aggregate(valid)
+
+    def _aggregate(self, valid: int) -> BurstReading:
+        reading = self.reading
+        reading.valid = valid
+        reading.valid_ratio = valid / self.pings
+        if not valid:
+            reading.distance = None
+            reading.confidence = 0.0
+            return reading
+
+        samples = self._samples
+        middle = valid // 2
+        if valid % 2:
+            reading.median = samples[middle]
+        else:
+            reading.median = (samples[middle - 1] + samples[middle]) / 2
+
+        # Only trim when something is left in the middle
+        trim = self.trim if valid > 2 * self.trim else 0
+        total = 0.0
+        for index in range(trim, valid - trim):
+            total += samples[index]
+        reading.trimmed_mean = total / (valid - 2 * trim)
+        reading.spread_cm = samples[valid - 1 - trim] - samples[trim]
+
+        # Full confidence needs every ping back and agreeing within tolerance
+        agreement = max(0.0, 1 - reading.spread_cm / self.tolerance_cm)
+        reading.confidence = reading.valid_ratio * agreement
+        if reading.valid_ratio >= self.min_valid_ratio:
+            reading.distance = reading.median
+        else:
+            reading.distance = None
+        return reading
@@ -0,0 +1,114 @@
+from array import array
+
+from .base import DistanceSensor
+
+
+class Filter:
+    def update(self, value: float) -> float | None:
+        raise NotImplementedError("This method should be overridden in subclasses.")
+
+    def reset(self) -> None:
+        raise NotImplementedError("This method should be overridden in subclasses.")
+
+
+class MedianFilter(Filter):
+    def __init__(self, size: int = 5) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        self._samples = array("f", [0] * size)
+        self._sorted = array("f", [0] * size)
+        self._index = 0
+        self._count = 0
+
+    def update(self, value: float) -> float | None:
+        samples = self._samples
+        samples[self._index] = value
+        self._index = (self._index + 1) % len(samples)
+        if self._count < len(samples):
+            self._count += 1
+
+        # Insertion sort into the scratch buffer; N is small
+        ordered = self._sorted
+        for i in range(self._count):
+            sample = samples[i]
+            j = i
+            while j > 0 and ordered[j - 1] > sample:
+                ordered[j] = ordered[j - 1]
+                j -= 1
+            ordered[j] = sample
+
+        return ordered[self._count // 2]
+
+    def reset(self) -> None:
+        self._index = 0
+        self._count = 0
+
+
+class EMAFilter(Filter):
+    def __init__(self, alpha: float = 0.5) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+
+        self.alpha = alpha
+        self._value: float | None = None
+
+    def update(self, value: float) -> float | None:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+    def reset(self) -> None:
+        self._value = None
+
+
+class OutlierFilter(Filter):
+    def __init__(self, max_jump_cm: float = 30, max_rejections: int = 2) -> None:
+        if max_jump_cm <= 0:
+            raise ValueError("max_jump_cm must be positive")
+        if max_rejections < 0:
+            raise ValueError("max_rejections cannot be negative")
+
+        self.max_jump_cm = max_jump_cm
+        self.max_rejections = max_rejections
+        self._last: float | None = None
+        self._rejections = 0
+
+    def update(self, value: float) -> float | None:
+        if (
+            self._last is not None
+            and abs(value - self._last) > self.max_jump_cm
+            and self._rejections < self.max_rejections
+        ):
+            self._rejections += 1
+            return
+
+        # Enough consecutive jumps mean the target really moved
+        self._last = value
+        self._rejections = 0
+        return value
+
+    def reset(self) -> None:
+        self._last = None
+        self._rejections = 0
+
+
+class FilteredDistanceSensor(DistanceSensor):
+    def __init__(self, sensor: DistanceSensor, filters: list[Filter]) -> None:
+        self.sensor = sensor
+        self.filters = filters
+
+    @property
+    def distance(self) -> float | None:
+        value = self.sensor.distance
+        for stage in self.filters:
+            if value is None:
+                return
+            value = stage.update(value)
+        return value
+
+    def reset(self) -> None:
+        for stage in self.filters:
+            stage.reset()
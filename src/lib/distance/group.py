@@ -0,0 +1,42 @@
+import time
+
+from .base import DistanceSensor
+
+
+class SensorGroup(DistanceSensor):
+    def __init__(self, sensors: list[DistanceSensor], guard_us: int = 15_000) -> None:
+        if not sensors:
+            raise ValueError("At least one sensor is required")
+        if guard_us < 0:
+            raise ValueError("guard_us cannot be negative")
+
+        self.sensors = sensors
+        self.guard_us = guard_us
+        # Index of the sensor that was triggered most recently
+        self.index = len(sensors) - 1
+        self._last_trigger_us: int | None = None
+
+    @property
+    def distance(self) -> float | None:
+        if self._last_trigger_us is not None:
+            wait_us = self.spacing_us(self.index) - time.ticks_diff(
+                time.ticks_us(), self._last_trigger_us
+            )
+            if wait_us > 0:
+                time.sleep_us(wait_us)
+
+        self.index = (self.index + 1) % len(self.sensors)
+        self._last_trigger_us = time.ticks_us()
+        return self.sensors[self.index].distance
+
+    def spacing_us(self, index: int) -> int:
+        # Echoes from a ping can arrive until the sensor's timeout has passed
+        return getattr(self.sensors[index], "echo_timeout_us", 0) + self.guard_us
+
+    @property
+    def min_interval_us(self) -> int:
+        return max(self.spacing_us(index) for index in range(len(self.sensors)))
+
+    @property
+    def cycle_us(self) -> int:
+        return sum(self.spacing_us(index) for index in range(len(self.sensors)))
@@ -1,3 +1,5 @@
+import time
+
 from lib.utils import Pin
 
 from .base import DistanceSensor
@@ -20,6 +22,80 @@ class HC_SR04(DistanceSensor):
                 # -1 indicates timeout due to waiting for initial condition
                 # -2 indicates timeout due to pulse not finishing
                 return
-            return (pulse_time * 0.0343) / 2  # cm
+            return self._to_cm(pulse_time)
         except Exception as e:
             print(e)
+
+    @staticmethod
+    def _to_cm(pulse_time: int) -> float:
+        return (pulse_time * 0.0343) / 2
+
+
+class HC_SR04_IRQ(HC_SR04):
+    def __init__(
+        self, trigger_pin: int, echo_pin: int, echo_timeout_us: int = 10_000
+    ) -> None:
+        super().__init__(trigger_pin, echo_pin, echo_timeout_us)
+
+        self._ping_us: int | None = None
+        self._rise_us = 0
+        # -1 marks a ping that timed out
+        self._pulse_us = -1
+        self._reading_us: int | None = None
+
+        self.echo.pin.irq(
+            handler=self._on_echo,
+            trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING,
+        )
+
+    @property
+    def distance(self) -> float | None:
+        reading = self.reading
+        self.ping()
+        return reading
+
+    @property
+    def reading(self) -> float | None:
+        self._expire()
+        if self._pulse_us < 0:
+            return
+        return self._to_cm(self._pulse_us)
+
+    @property
+    def age_us(self) -> int | None:
+        if self._reading_us is None:
+            return
+        return time.ticks_diff(time.ticks_us(), self._reading_us)
+
+    @property
+    def is_pending(self) -> bool:
+        self._expire()
+        return self._ping_us is not None
+
+    def ping(self) -> None:
+        if self.is_pending:
+            return
+
+        self._ping_us = time.ticks_us()
+        self.trigger.send_pulse_us(10)
+
+    def _expire(self) -> None:
+        # time_pulse_us allows the timeout for both the wait and the pulse
+        if (
+            self._ping_us is not None
+            and time.ticks_diff(time.ticks_us(), self._ping_us)
+            > 2 * self.echo_timeout_us
+        ):
+            self._finish(-1)
+
+    def _finish(self, pulse_us: int) -> None:
+        self._ping_us = None
+        self._pulse_us = pulse_us
+        self._reading_us = time.ticks_us()
+
+    def _on_echo(self, pin) -> None:
+        now = time.ticks_us()
+        if pin.value():
+            self._rise_us = now
+        elif self._ping_us is not None:
+            self._finish(time.ticks_diff(now, self._rise_us))
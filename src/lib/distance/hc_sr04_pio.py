@@ -0,0 +1,95 @@
+import rp2
+
+from .hc_sr04 import HC_SR04
+
+# Two cycles per loop iteration, so counters tick once per microsecond
+_PIO_FREQ = 2_000_000
+# What a counter reads after running out, for both the rising edge and the pulse
+_TIMED_OUT = 0xFFFFFFFF
+
+
+@rp2.asm_pio(set_init=rp2.PIO.OUT_LOW)
+def _ranging_program():
+    # The CPU sends the echo timeout in microseconds once, kept in x
+    pull(block)
+    mov(x, osr)
+    wrap_target()
+    # A late echo from the previous ping must not start this one
+    wait(0, pin, 0)
+    set(pins, 1)[19]
+    set(pins, 0)
+    mov(y, x)
+    label("wait_rise")
+    jmp(pin, "rising")
+    jmp(y_dec, "wait_rise")
+    jmp("push")
+    label("rising")
+    mov(y, x)
+    label("count")
+    jmp(pin, "high")
+    jmp("push")
+    label("high")
+    jmp(y_dec, "count")
+    label("push")
+    # x - y is the pulse width, or y is _TIMED_OUT
+    mov(isr, y)
+    push(noblock)
+    # Has the CPU drain the FIFO, which would otherwise fill up and keep
+    # the four oldest results while newer ones are dropped
+    irq(rel(0))
+    # Let stray echoes die down, four microseconds per count
+    mov(y, x)
+    label("gap")
+    jmp(y_dec, "gap")[7]
+    wrap()
+
+
+class HC_SR04_PIO(HC_SR04):
+    def __init__(
+        self,
+        trigger_pin: int,
+        echo_pin: int,
+        echo_timeout_us: int = 10_000,
+        state_machine: int = 0,
+    ) -> None:
+        super().__init__(trigger_pin, echo_pin, echo_timeout_us)
+
+        # -1 marks a ping that timed out
+        self._pulse_us = -1
+        self.readings = 0
+        self.timeouts = 0
+
+        self._sm = rp2.StateMachine(
+            state_machine,
+            _ranging_program,
+            freq=_PIO_FREQ,
+            set_base=self.trigger.pin,
+            in_base=self.echo.pin,
+            jmp_pin=self.echo.pin,
+        )
+        self._sm.put(echo_timeout_us)
+        self._sm.irq(self._on_result)
+        self._sm.active(1)
+
+    @property
+    def distance(self) -> float | None:
+        # The newest result the IRQ handler stored; never waits for a ping.
+        # Only the handler reads the FIFO: reading it here too could see a
+        # result the handler then takes, leaving get() blocked.
+        if self._pulse_us < 0:
+            return
+        return self._to_cm(self._pulse_us)
+
+    def stop(self) -> None:
+        self._sm.active(0)
+        self._sm.irq(None)
+
+    def _on_result(self, sm) -> None:
+        while sm.rx_fifo():
+            count = sm.get()
+            self.readings += 1
+            if count == _TIMED_OUT:
+                self.timeouts += 1
+                self._pulse_us = -1
+            else:
+                self._pulse_us = self.echo_timeout_us - count
@@ -5,6 +5,7 @@ from machine import I2C
 from lib.utils import Pin
 
 from .base import LCD
+from .st7032 import ST7032Encoder
 
 
 class AE_AQM0802_I2C(LCD):
@@ -15,75 +16,18 @@ class AE_AQM0802_I2C(LCD):
 
     _CONTROL_BYTE_COMMAND = 0x00
     _CONTROL_BYTE_DATA = 0x40
+    _CONTINUATION = 0x80
 
-    _ST7032_CHAR_MAP = {
-        "→": 0x7E,
-        "←": 0x7F,
-        "°": 0xDF,
-        "。": 0xA1,
-        "「": 0xA2,
-        "」": 0xA3,
-        "、": 0xA4,
-        "・": 0xA5,
-        "ヲ": 0xA6,
-        "ァ": 0xA7,
-        "ィ": 0xA8,
-        "ゥ": 0xA9,
-        "ェ": 0xAA,
-        "ォ": 0xAB,
-        "ャ": 0xAC,
-        "ュ": 0xAD,
-        "ョ": 0xAE,
-        "ッ": 0xAF,
-        "ー": 0xB0,
-        "ア": 0xB1,
-        "イ": 0xB2,
-        "ウ": 0xB3,
-        "エ": 0xB4,
-        "オ": 0xB5,
-        "カ": 0xB6,
-        "キ": 0xB7,
-        "ク": 0xB8,
-        "ケ": 0xB9,
-        "コ": 0xBA,
-        "サ": 0xBB,
-        "シ": 0xBC,
-        "ス": 0xBD,
-        "セ": 0xBE,
-        "ソ": 0xBF,
-        "タ": 0xC0,
-        "チ": 0xC1,
-        "ツ": 0xC2,
-        "テ": 0xC3,
-        "ト": 0xC4,
-        "ナ": 0xC5,
-        "ニ": 0xC6,
-        "ヌ": 0xC7,
-        "ネ": 0xC8,
-        "ノ": 0xC9,
-        "ハ": 0xCA,
-        "ヒ": 0xCB,
-        "フ": 0xCC,
-        "ヘ": 0xCD,
-        "ホ": 0xCE,
-        "マ": 0xCF,
-        "ミ": 0xD0,
-        "ム": 0xD1,
-        "メ": 0xD2,
-        "モ": 0xD3,
-        "ヤ": 0xD4,
-        "ユ": 0xD5,
-        "ヨ": 0xD6,
-        "ラ": 0xD7,
-        "リ": 0xD8,
-        "ル": 0xD9,
-        "レ": 0xDA,
-        "ロ": 0xDB,
-        "ワ": 0xDC,
-        "ン": 0xDD,
-        "゛": 0xDE,
-        "゜": 0xDF,
-    }
+    # One cursor command and a full row in a single transaction
+    _BUFFER_SIZE = 16
+    # Unchanged cells are resent rather than starting a new transaction
+    _MAX_MERGED_GAP = 3
+
+    # An absent display is probed again after 0.5 s, doubling up to 32 s. A
+    # present one is probed every 0.5 s, as unchanged frames write nothing
+    # that could fail.
+    _PROBE_BACKOFF_MS = 500
+    _MAX_PROBE_BACKOFF_SHIFT = 6
 
     def __init__(
         self,
@@ -92,41 +36,175 @@ class AE_AQM0802_I2C(LCD):
         addr: int = 0x3E,
         reset_pin: int | None = None,
         initialize: bool = True,
+        defer_init: bool = False,
         show_cursor: bool = False,
         blinking: bool = False,
     ):
         self.i2c = I2C(0, scl=Pin(clock_pin).pin, sda=Pin(data_pin).pin, freq=400_000)
         self.addr = addr
-
-        if not self.is_available():
-            print(f"LCD at address {hex(addr)} not found.")
-            return
+        self._encoder = ST7032Encoder(width=len(self.VALID_ADDRESSES[0]))
+
+        # Shadow copy of the visible DDRAM cells. Only the first
+        # `_known_columns[row]` cells of each row are known to match the
+        # display; anything past that is always transmitted.
+        self._shadow = [bytearray(len(row)) for row in self.VALID_ADDRESSES]
+        self._known_columns = [0] * len(self.VALID_ADDRESSES)
+
+        self._buffer = bytearray(self._BUFFER_SIZE)
+        self._buffer_view = memoryview(self._buffer)
+        self._batch_length = 0
+
+        self.transactions = 0
+        self.bytes_sent = 0
+        self.transactions_saved = 0
+        self.bytes_saved = 0
+
+        # Pending initialisation steps, advanced by `poll` when deferred
+        self._init_steps = None
+        self._init_due_ms = 0
+        self._pending = None
+        # The last frame drawn, kept to redraw if the display goes away
+        self._frame = None
+        self._initialize = initialize
+        self._show_cursor = show_cursor
+        self._blinking = blinking
+
+        self.probes = 0
+        self.probe_failures = 0
+        self.probe_us = 0
+        self.write_failures = 0
+        self._present = False
+        self._failed_probes = 0
+        self._next_probe_ms = 0
 
         self.reset_pin = Pin(reset_pin, Pin.OUT) if reset_pin else None
         self.full_length_bus = True
         self.single_line = False
         self.double_height_font = False
         self.instruction_table = 0
+
+        if not self.probe():
+            # Initialised by `poll` once the display shows up
+            print(f"LCD at address {hex(addr)} not found.")
+            return
+
         if initialize:
-            time.sleep_ms(50)
-            self.function_set(instruction_table=1)
-            self.internal_osc_frequency(high_bias=False, frequency=0x04)
-            self.power_icon_ctrl_contrast_set(
-                icon_display_on=False,
-                booster_on=True,
-                contrast=0x02,
-            )
-            self.set_contrast(contrast=0x00)
-            self.follower_control(follower_on=True, amplified_ratio=0x04)
-            time.sleep_ms(200)
-            self.function_set(instruction_table=0)
-            self.display_on_off(display=True, cursor=show_cursor, blink=blinking)
-            self.clear()
-            self.entry_mode_set(left_to_right=True, shift=False)
+            self._init_steps = self._initialization(show_cursor, blinking)
+            if not defer_init:
+                for delay_ms in self._init_steps:
+                    time.sleep_ms(delay_ms)
+                self._init_steps = None
+
+    def _initialization(self, show_cursor: bool, blinking: bool):
+        # Yields the milliseconds to wait before the next step may run
+        yield 50
+        self._begin_batch()
+        self.function_set(instruction_table=1)
+        self.internal_osc_frequency(high_bias=False, frequency=0x04)
+        self.power_icon_ctrl_contrast_set(
+            icon_display_on=False,
+            booster_on=True,
+            contrast=0x02,
+        )
+        self.set_contrast(contrast=0x00)
+        self.follower_control(follower_on=True, amplified_ratio=0x04)
+        self._end_batch()
+        yield 200
+        self._begin_batch()
+        self.function_set(instruction_table=0)
+        self.display_on_off(display=True, cursor=show_cursor, blink=blinking)
+        # Clearing resets I/D anyway, so the entry mode can go first
+        self.entry_mode_set(left_to_right=True, shift=False)
+        self._end_batch()
+        self.clear()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._present and self._init_steps is None
+
+    def poll(self) -> bool:
+        now = time.ticks_ms()
+        if self._present and time.ticks_diff(now, self._next_probe_ms) >= 0:
+            self._next_probe_ms = time.ticks_add(now, self._PROBE_BACKOFF_MS)
+            # Marks the display absent if it has gone
+            self.probe()
+        if not self._present:
+            if not self.is_available():
+                return False
+            # Reconnected, so the controller has to be set up from scratch
+            self.instruction_table = 0
+            self.invalidate()
+            if self._initialize:
+                self._init_steps = self._initialization(
+                    self._show_cursor, self._blinking
+                )
+                self._init_due_ms = time.ticks_ms()
+            else:
+                self._write_pending()
+                return self._present
+        if self._init_steps is None:
+            return True
+        if time.ticks_diff(time.ticks_ms(), self._init_due_ms) < 0:
+            return False
+        try:
+            delay_ms = next(self._init_steps)
+        except StopIteration:
+            self._init_steps = None
+            self._write_pending()
+            return self._present
+        self._init_due_ms = time.ticks_add(time.ticks_ms(), delay_ms)
+        return False
+
+    def _write_pending(self):
+        # Show whatever was written while the controller was absent or
+        # starting up
+        pending = self._pending
+        self._pending = None
+        if pending is not None:
+            self.write(pending)
+
+    def poll_due_ms(self) -> int | None:
+        # Only a started initialisation is timed; probing waits for a write
+        if not self._present or self._init_steps is None:
+            return None
+        return max(0, time.ticks_diff(self._init_due_ms, time.ticks_ms()))
 
     def is_available(self) -> bool:
-        devices = self.i2c.scan()
-        return self.addr in devices
+        # Cached; an absent display is only re-probed once its backoff expires
+        if not self._present and (
+            time.ticks_diff(time.ticks_ms(), self._next_probe_ms) >= 0
+        ):
+            self.probe()
+        return self._present
+
+    def probe(self) -> bool:
+        # An address-only write, acknowledged only by the display itself
+        started = time.ticks_us()
+        try:
+            self.i2c.writeto(self.addr, b"")
+            present = True
+        except OSError:
+            present = False
+        self.probe_us += time.ticks_diff(time.ticks_us(), started)
+        self.probes += 1
+        if present:
+            self._present = True
+            self._failed_probes = 0
+        else:
+            self.probe_failures += 1
+            self._mark_absent()
+        return present
+
+    def _mark_absent(self):
+        shift = min(self._failed_probes, self._MAX_PROBE_BACKOFF_SHIFT)
+        self._failed_probes += 1
+        self._next_probe_ms = time.ticks_add(
+            time.ticks_ms(), self._PROBE_BACKOFF_MS << shift
+        )
+        self._present = False
+        self.invalidate()
+        if self._pending is None:
+            self._pending = self._frame
 
     def reset(self):
         if self.reset_pin is not None:
@@ -136,8 +214,16 @@ class AE_AQM0802_I2C(LCD):
             time.sleep_ms(5)
 
     def clear(self):
-        self.send_command(0x01)
+        self._buffer[0] = self._CONTROL_BYTE_COMMAND
+        self._buffer[1] = 0x01
+        self._transmit(2)
         time.sleep_us(1100)
+        for shadow in self._shadow:
+            shadow[:] = b" " * len(shadow)
+        self._known_columns = [len(shadow) for shadow in self._shadow]
+
+    def invalidate(self):
+        self._known_columns = [0] * len(self._shadow)
 
     def return_home(self):
         self.send_command(0x02)
@@ -278,13 +364,33 @@ class AE_AQM0802_I2C(LCD):
         cmd = 0x70 | contrast
         self.send_command(cmd)
 
-    def write(self, text: str):
-        lines = text.splitlines()
-
-        for row, line in enumerate(lines):
-            if row >= len(self.VALID_ADDRESSES):
+    def write(self, text: str | bytes):
+        if not self._present or self._init_steps is not None:
+            self._pending = text
+            self.poll()
+            return
+        # Callers that skip unchanged frames will not send it again, so a
+        # display found unplugged is redrawn from here once it is back
+        self._frame = text
+        if not isinstance(text, str):
+            self._write_encoded(text)
+        else:
+            for row, line in enumerate(text.splitlines()):
+                if row >= len(self.VALID_ADDRESSES):
+                    break
+                self.write_line(row, line)
+
+    def _write_encoded(self, data: bytes):
+        # Character codes with rows separated by newlines, e.g. a render buffer
+        start = 0
+        for row in range(len(self.VALID_ADDRESSES)):
+            end = start
+            while end < len(data) and data[end] != 0x0A:
+                end += 1
+            self._write_row(row, data, start, end - start)
+            if end >= len(data):
                 break
-            self.write_line(row, line)
+            start = end + 1
 
     def write_line(self, row: int, text: str):
         if not (0 <= row < len(self.VALID_ADDRESSES)):
@@ -292,15 +398,51 @@ class AE_AQM0802_I2C(LCD):
                 f"Row {row} out of bounds for {len(self.VALID_ADDRESSES[0])} row display."
             )
 
-        self.set_cursor(row, 0)
+        data = self.encode(text)
+        self._write_row(row, data, 0, len(data))
+
+    def _write_row(self, row: int, data: bytes, offset: int, length: int):
+        shadow = self._shadow[row]
+        length = min(length, len(shadow))
+        known = self._known_columns[row]
+        transactions = self.transactions
+        bytes_sent = self.bytes_sent
+
+        column = 0
+        while column < length:
+            if column < known and data[offset + column] == shadow[column]:
+                column += 1
+                continue
+
+            start = end = column
+            while column < length and column - end <= self._MAX_MERGED_GAP:
+                if column >= known or data[offset + column] != shadow[column]:
+                    shadow[column] = data[offset + column]
+                    end = column + 1
+                column += 1
+            self._write_run(row, start, data, offset, end)
+            column = end
+
+        self._known_columns[row] = max(known, length)
+
+        # Compare against writing the cursor and every character separately
+        self.transactions_saved += 1 + length - (self.transactions - transactions)
+        self.bytes_saved += 2 * (1 + length) - (self.bytes_sent - bytes_sent)
+
+    def _write_run(self, row: int, start: int, data: bytes, offset: int, end: int):
+        buffer = self._buffer
+        buffer[0] = self._CONTROL_BYTE_COMMAND | self._CONTINUATION
+        buffer[1] = 0x80 | self.VALID_ADDRESSES[row][start]
+        buffer[2] = self._CONTROL_BYTE_DATA
+        length = 3
+        for column in range(start, end):
+            buffer[length] = data[offset + column]
+            length += 1
+        self._transmit(length)
+        time.sleep_us(30)
 
-        for char in text:
-            if char in self._ST7032_CHAR_MAP:
-                self.send_data(self._ST7032_CHAR_MAP[char])
-            else:
-                char_code = ord(char)
-                if 0 <= char_code <= 0xFF:
-                    self.send_data(char_code)
+    def encode(self, text: str) -> bytes:
+        return self._encoder.encode(text)
 
     def set_cursor(self, line: int, column: int):
         if not (
@@ -313,9 +455,45 @@ class AE_AQM0802_I2C(LCD):
         self.set_ddram_address(self.VALID_ADDRESSES[line][column])
 
     def send_command(self, cmd_byte: int):
-        self.i2c.writeto(self.addr, bytes([self._CONTROL_BYTE_COMMAND, cmd_byte]))
+        if self._batch_length:
+            if self._batch_length == self._BUFFER_SIZE:
+                self._end_batch()
+                self._begin_batch()
+            self._buffer[self._batch_length] = cmd_byte
+            self._batch_length += 1
+            return
+
+        self._buffer[0] = self._CONTROL_BYTE_COMMAND
+        self._buffer[1] = cmd_byte
+        self._transmit(2)
         time.sleep_us(30)
 
     def send_data(self, data_byte: int):
-        self.i2c.writeto(self.addr, bytes([self._CONTROL_BYTE_DATA, data_byte]))
+        self._buffer[0] = self._CONTROL_BYTE_DATA
+        self._buffer[1] = data_byte
+        self._transmit(2)
         time.sleep_us(30)
+
+    def _begin_batch(self):
+        # Commands are queued until _end_batch sends them as one stream
+        self._buffer[0] = self._CONTROL_BYTE_COMMAND
+        self._batch_length = 1
+
+    def _end_batch(self):
+        length, self._batch_length = self._batch_length, 0
+        if length > 1:
+            self._transmit(length)
+            time.sleep_us(30)
+
+    def _transmit(self, length: int):
+        if not self._present:
+            return
+        try:
+            self.i2c.writeto(self.addr, self._buffer_view[:length])
+        except OSError:
+            # Unplugged; writes are dropped until a probe finds it again
+            self.write_failures += 1
+            self._mark_absent()
+            return
+        self.transactions += 1
+        self.bytes_sent += length
@@ -5,7 +5,7 @@ class LCD:
     def return_home(self):
         raise NotImplementedError("This method should be overridden by subclasses.")
 
-    def write(self, text: str) -> None:
+    def write(self, text: str | bytes) -> None:
         raise NotImplementedError("This method should be overridden by subclasses.")
 
     def write_line(self, line: int, text: str) -> None:
@@ -14,5 +14,12 @@ class LCD:
     def set_cursor(self, line: int, col: int) -> None:
         raise NotImplementedError("This method should be overridden by subclasses.")
 
+    def poll(self) -> bool:
+        return True
+
+    def poll_due_ms(self) -> int | None:
+        # Milliseconds until `poll` has work to do, or None if it has none
+        return None
+
     def is_available(self) -> bool:
         raise NotImplementedError("This method should be overridden by subclasses.")
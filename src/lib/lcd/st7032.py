@@ -0,0 +1,55 @@
+class ST7032Encoder:
+    # Katakana and punctuation occupy 0xA1-0xDF in order
+    _KANA = "。「」、・ヲァィゥェォャュョッーアイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワン゛゜"
+    _KANA_OFFSET = 0xA1
+    _SYMBOLS = "→←°"
+    _SYMBOL_CODES = b"\x7e\x7f\xdf"
+
+    def __init__(self, width: int, cache_size: int = 8) -> None:
+        if cache_size <= 0:
+            raise ValueError("cache_size must be positive")
+
+        self.width = width
+        self._cache_keys: list[str | None] = [None] * cache_size
+        self._cache_values: list[bytes] = [b""] * cache_size
+
+    def encode(self, text: str) -> bytes:
+        keys = self._cache_keys
+        values = self._cache_values
+        for index in range(len(keys)):
+            if keys[index] == text:
+                encoded = values[index]
+                self._promote(index, text, encoded)
+                return encoded
+
+        encoded = self._encode(text)
+        self._promote(len(keys) - 1, text, encoded)
+        return encoded
+
+    def _promote(self, index: int, text: str, encoded: bytes) -> None:
+        keys = self._cache_keys
+        values = self._cache_values
+        while index > 0:
+            keys[index] = keys[index - 1]
+            values[index] = values[index - 1]
+            index -= 1
+        keys[0] = text
+        values[0] = encoded
+
+    def _encode(self, text: str) -> bytes:
+        encoded = text.encode()
+        if len(encoded) == len(text):
+            # Plain ASCII maps onto the character ROM unchanged
+            return encoded[: self.width]
+
+        data = bytearray()
+        for char in text:
+            if len(data) >= self.width:
+                break
+            if (index := self._SYMBOLS.find(char)) >= 0:
+                data.append(self._SYMBOL_CODES[index])
+            elif (index := self._KANA.find(char)) >= 0:
+                data.append(self._KANA_OFFSET + index)
+            elif (char_code := ord(char)) <= 0xFF:
+                data.append(char_code)
+        return bytes(data)
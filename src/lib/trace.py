@@ -0,0 +1,168 @@
+import os
+import struct
+import time
+
+from lib.distance import DistanceSensor
+
+# ticks_ms, kind, value; padded to eight bytes
+RECORD_FORMAT = "<IBxH"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+MAGIC = b"LTR1"
+
+KIND_SAMPLE = 0
+KIND_STATE = 1
+# Starts the records of one boot
+KIND_SESSION = 2
+
+# Samples are stored in millimetres; this marks a missed echo
+NO_DISTANCE = 0xFFFF
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_HALF_PERIOD = _TICKS_PERIOD // 2
+
+
+class TraceRecorder:
+    def __init__(
+        self,
+        path: str,
+        block_records: int = 64,
+        max_bytes: int | None = None,
+    ) -> None:
+        if block_records <= 0:
+            raise ValueError("block_records must be positive")
+
+        self.path = path
+        self._buffer = bytearray(block_records * RECORD_SIZE)
+        self._length = 0
+        self.records = 0
+
+        # Earlier sessions are kept: after a power cycle the interesting one
+        # is usually the one before. A full file moves to `path`.old.
+        size = _file_size(path)
+        if size is not None and max_bytes is not None and size >= max_bytes:
+            try:
+                os.remove(path + ".old")
+            except OSError:
+                pass
+            os.rename(path, path + ".old")
+            size = None
+        if size is None or size < len(MAGIC):
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+        elif (size - len(MAGIC)) % RECORD_SIZE:
+            # Realign after a record cut short by power loss by padding it
+            # with 0xFF. Cut before its kind byte, it has an unknown kind and
+            # replay skips it; cut later, it replays with 0xFF in place of
+            # the lost value bytes, a missed echo if a sample lost both.
+            with open(path, "ab") as f:
+                f.write(b"\xff" * (RECORD_SIZE - (size - len(MAGIC)) % RECORD_SIZE))
+
+        self._append(KIND_SESSION, 0)
+        self.flush()
+
+    def record_sample(self, distance: float | None) -> None:
+        if distance is None:
+            value = NO_DISTANCE
+        else:
+            value = min(int(distance * 10), NO_DISTANCE - 1)
+        self._append(KIND_SAMPLE, value)
+
+    def record_state(self, state_id: int) -> None:
+        self._append(KIND_STATE, state_id)
+        # State changes are rare and the point of a recording, so they are
+        # not left in RAM for a reset to lose
+        self.flush()
+
+    def _append(self, kind: int, value: int) -> None:
+        struct.pack_into(
+            RECORD_FORMAT, self._buffer, self._length, time.ticks_ms(), kind, value
+        )
+        self._length += RECORD_SIZE
+        self.records += 1
+        if self._length == len(self._buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._length:
+            return
+
+        # Reopening per block keeps everything before a power loss readable
+        with open(self.path, "ab") as f:
+            f.write(memoryview(self._buffer)[: self._length])
+        self._length = 0
+
+
+def _file_size(path: str) -> int | None:
+    try:
+        return os.stat(path)[6]
+    except OSError:
+        return None
+
+
+class TraceReplay(DistanceSensor):
+    def __init__(
+        self,
+        path: str,
+        block_records: int = 64,
+        session: int | None = None,
+    ) -> None:
+        # `session` picks one boot's records; by default all are replayed
+        self._file = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a trace recording")
+
+        self._buffer = bytearray(block_records * RECORD_SIZE)
+        self._length = 0
+        self._offset = 0
+        self._ticks_ms = 0
+        self._session = session
+        self.sessions = 0
+        self.state_id: int | None = None
+
+    @property
+    def distance(self) -> float | None:
+        while True:
+            ticks_ms, kind, value = self._next_record()
+            if kind == KIND_SESSION:
+                self.sessions += 1
+                if self._session is not None and self.sessions > self._session + 1:
+                    self._file.close()
+                    raise EOFError("End of session")
+                continue
+            if self._session is not None and self.sessions != self._session + 1:
+                continue
+            self._ticks_ms = ticks_ms
+            if kind == KIND_STATE:
+                self.state_id = value
+            elif kind != KIND_SAMPLE:
+                continue
+            elif value == NO_DISTANCE:
+                return
+            else:
+                return value / 10
+
+    def _next_record(self) -> tuple[int, int, int]:
+        if self._offset + RECORD_SIZE > self._length:
+            self._length = self._file.readinto(self._buffer) or 0
+            self._offset = 0
+            # A record cut short by power loss is dropped, not read stale
+            if self._length < RECORD_SIZE:
+                self._file.close()
+                raise EOFError("End of trace")
+
+        record = struct.unpack_from(RECORD_FORMAT, self._buffer, self._offset)
+        self._offset += RECORD_SIZE
+        return record
+
+    # Recorded timestamps stand in for a clock, so a monitor replays with
+    # the original timing
+
+    def ticks_ms(self) -> int:
+        return self._ticks_ms
+
+    @staticmethod
+    def ticks_diff(end: int, start: int) -> int:
+        return (
+            (end - start + _TICKS_HALF_PERIOD) % _TICKS_PERIOD
+        ) - _TICKS_HALF_PERIOD
@@ -142,3 +142,92 @@ class StateMachine:
                 return True
 
         return False
+
+
+class CompiledStateMachine(StateMachine):
+    NO_TRANSITION = 0xFF
+
+    def __init__(
+        self,
+        initial_state: str,
+        transitions: dict[str, dict[str, str]],
+        *,
+        states: tuple[str, ...] = (),
+        events: tuple[str, ...] = (),
+    ):
+        # `states` and `events` pin the ids of the names they list; any other
+        # names are numbered after them in order of appearance.
+        state_names = list(states)
+        event_names = list(events)
+        for state, state_transitions in transitions.items():
+            for name in [state, *state_transitions.values()]:
+                if name not in state_names:
+                    state_names.append(name)
+            for event in state_transitions:
+                if event not in event_names:
+                    event_names.append(event)
+        if initial_state not in state_names:
+            state_names.append(initial_state)
+        if len(state_names) >= self.NO_TRANSITION:
+            raise ValueError("Too many states for a byte transition table.")
+
+        self.states = tuple(state_names)
+        self.events = tuple(event_names)
+        self._state_ids = {state: i for i, state in enumerate(self.states)}
+        self._event_ids = {event: i for i, event in enumerate(self.events)}
+
+        # A row of targets per state, indexed by event id. The current row
+        # is kept alongside the id, so a transition is a single index.
+        rows = [bytearray([self.NO_TRANSITION] * len(self.events)) for _ in self.states]
+        for state, state_transitions in transitions.items():
+            row = rows[self._state_ids[state]]
+            for event, target in state_transitions.items():
+                row[self._event_ids[event]] = self._state_ids[target]
+        self._rows = tuple(bytes(row) for row in rows)
+
+        # Sets the state through the property below, once the rows exist
+        super().__init__(initial_state, transitions)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @state.setter
+    def state(self, state: str) -> None:
+        # Assigning a state, as StateMachine allows, also moves the row
+        self._row = self._rows[self._state_ids[state]]
+        self._state = state
+
+    @property
+    def state_id(self) -> int:
+        return self._state_ids[self._state]
+
+    def state_id_of(self, state: str) -> int:
+        return self._state_ids[state]
+
+    def event_id_of(self, event: str) -> int:
+        return self._event_ids[event]
+
+    def transition(self, event: str) -> bool:
+        try:
+            event_id = self._event_ids[event]
+        except KeyError:
+            return False
+
+        # Inlined rather than calling transition_id to save a method call
+        target = self._row[event_id]
+        if target == self.NO_TRANSITION:
+            return False
+
+        self._state = self.states[target]
+        self._row = self._rows[target]
+        return True
+
+    def transition_id(self, event_id: int) -> bool:
+        target = self._row[event_id]
+        if target == self.NO_TRANSITION:
+            return False
+
+        self._state = self.states[target]
+        self._row = self._rows[target]
+        return True
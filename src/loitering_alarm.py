@@ -1,10 +1,43 @@
+import math
 import time
 
 from controllers import LEDController
-from states import State
-from writers import Writer, lcd_formatter, serial_writer
+from loitering_monitor import LoiteringMonitor
+from sampling import SamplingPolicy
+from stages import Stage
+from states import STATES, State
+from writers import Writer, WriterPolicy, lcd_formatter, serial_writer
 
-from lib import LCD, Buzzer, DistanceSensor
+from lib import (
+    LCD,
+    Buzzer,
+    BuzzerSequencer,
+    DistanceSensor,
+    Pattern,
+    Pulse,
+)
+
+try:
+    from typing import TYPE_CHECKING
+except ImportError:
+    # MicroPython has no typing module
+    TYPE_CHECKING = False
+
+# asyncio, _thread, instrumentation, telemetry and the trace recorder are
+# imported only by the options that use them, keeping them out of boot time
+if TYPE_CHECKING:
+    from dual_core import SnapshotRing
+    from instrumentation import LoopProfiler, MemoryMonitor
+    from telemetry import FrameRing
+
+    from lib import TraceRecorder
+
+# Slow chirps that speed up and rise in pitch, then repeat the last one
+ALARM_PULSES = [
+    *[Pulse(duration_ms=100, rest_ms=900, freq=2000)] * 3,
+    *[Pulse(duration_ms=100, rest_ms=400, freq=2500)] * 4,
+    Pulse(duration_ms=150, rest_ms=100, freq=3000),
+]
 
 
 class LoiteringAlarm:
@@ -18,16 +51,65 @@ class LoiteringAlarm:
         min_distance_cm: float = 60,
         max_distance_cm: float = 120,
         led_controller: LEDController = LEDController(pin_number=25),
+        sampling_policy: SamplingPolicy | None = None,
+        recorder: "TraceRecorder | None" = None,
+        max_write_rate_hz: float | None = None,
+        binary_telemetry: bool = False,
+        profiler: "LoopProfiler | None" = None,
+        memory_monitor: "MemoryMonitor | None" = None,
+        alarm_pattern: Pattern | None = None,
         debug: bool = False,
     ) -> None:
         self.distance_sensor = distance_sensor
         self.display = display
         self.buzzer = buzzer
+        self.sequencer = BuzzerSequencer(buzzer)
+        if alarm_pattern is None:
+            alarm_pattern = Pattern(
+                ALARM_PULSES,
+                duty_cycle=buzzer.duty_cycle,
+                loop_from=len(ALARM_PULSES) - 1,
+            )
+        self.alarm_pattern = alarm_pattern
         self.monitor = monitor
+        # What the outputs show: the monitor itself, or in dual-core mode the
+        # latest snapshot published by the sensing core
+        self._status = monitor
+        self.snapshots: SnapshotRing | None = None
+        self._produced: float | None = None
+        self._running = False
+        # Set when the sensing core stops on an exception
+        self.producer_error: Exception | None = None
         self.min_distance_cm = min_distance_cm
         self.max_distance_cm = max_distance_cm
 
         self.led = led_controller
+        self.sampling_policy = sampling_policy
+        self.recorder = recorder
+        self.profiler = profiler
+        self.memory_monitor = memory_monitor
+        # Empty when instrumentation is disabled, so marking is a no-op loop
+        self._instruments = tuple(
+            instrument
+            for instrument in (profiler, memory_monitor)
+            if instrument is not None
+        )
+        self._console = None
+        if self._instruments:
+            from instrumentation import DebugConsole
+
+            self._console = DebugConsole()
+        self._distance: float | None = None
+        # Reused every iteration so writing telemetry does not allocate
+        self._data = {
+            "distance": 0,
+            "state": State.IDLE,
+            "time_to_alert": 0,
+            "time_to_reset": 0,
+        }
+        self._period = self._next_period()
+        # Time the monitor has not been told about when the next sample lands
+        self._unaccounted = self._period
 
         self._action_handlers = {
             State.IDLE: self._action_idle,
@@ -37,55 +119,287 @@ class LoiteringAlarm:
             State.ARMED: self._action_armed,
         }
 
-        self._writers = []
-        if debug:
-            self._writers.append(serial_writer)
-        if self.display.is_available():
-            self._writers.append(Writer(self.display.write, lcd_formatter))
+        self.telemetry: "FrameRing | None" = None
+        self.writers: list[WriterPolicy] = []
+        if debug and binary_telemetry:
+            from telemetry import FrameFormatter, FrameRing
+
+            # Every frame carries a new sequence number, so none are unchanged
+            self.telemetry = FrameRing()
+            self.writers.append(
+                WriterPolicy(
+                    Writer(self.telemetry.write, FrameFormatter()),
+                    max_rate_hz=max_write_rate_hz,
+                )
+            )
+        elif debug:
+            self.writers.append(
+                WriterPolicy(
+                    serial_writer,
+                    skip_unchanged=True,
+                    max_rate_hz=max_write_rate_hz,
+                )
+            )
+        # An absent display keeps the latest frame until it is plugged in
+        self.writers.append(
+            WriterPolicy(
+                Writer(self.display.write, lcd_formatter),
+                skip_unchanged=True,
+                max_rate_hz=max_write_rate_hz,
+            )
+        )
 
     def run(self):
+        self._running = True
+        try:
+            while self._running:
+                self._sense()
+                self._act()
+                self._write_latest()
+                self._finish_instruments()
+                for delay in self._waits():
+                    time.sleep(delay)
+        finally:
+            self._running = False
+            self._flush_recorder()
+
+    def run_dual_core(self, *, ui_period: float = 0.1, capacity: int = 8) -> None:
+        # Ranging and the monitor run on the second core; actions and writers
+        # stay here and only ever see published snapshots.
+        if self._instruments:
+            raise ValueError("Instrumentation is not supported in dual-core mode.")
+
+        import _thread
+
+        from dual_core import Snapshot, SnapshotRing
+
+        snapshots = SnapshotRing(capacity)
+        snapshot = Snapshot()
+        self.snapshots = snapshots
+        self._status = snapshot
+        self._running = True
+        self.producer_error = None
+        _thread.start_new_thread(self._produce, (snapshots,))
+        try:
+            while self._running:
+                if snapshots.take_latest(snapshot):
+                    self._distance = snapshot.distance
+                self._act()
+                self._write_latest()
+                time.sleep(ui_period)
+        finally:
+            self._running = False
+            # Back to single-core: the monitor drives the outputs again
+            self.snapshots = None
+            self._status = self.monitor
+
+        if self.producer_error is not None:
+            # The outputs would otherwise keep showing the last snapshot
+            self.sequencer.stop()
+            raise self.producer_error
+
+    def stop(self) -> None:
+        self._running = False
+
+    def _flush_recorder(self) -> None:
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    def _produce(self, snapshots: "SnapshotRing") -> None:
+        try:
+            while self._running:
+                self._produced = self._sample()
+                self._period = self._next_period()
+                snapshots.publish(self._produced, self.monitor)
+                for delay in self._waits():
+                    time.sleep(delay)
+        except Exception as error:
+            # A thread's exception is only printed, so it is handed over to
+            # be raised on the UI core
+            self.producer_error = error
+        finally:
+            self._running = False
+            # The recorder belongs to this core, so it is flushed here
+            self._flush_recorder()
+
+    def run_async(
+        self,
+        *,
+        write_period: float = 0.5,
+        action_period: float = 0.1,
+    ) -> None:
+        import asyncio
+
+        self._running = True
+        try:
+            asyncio.run(
+                self._run_async(write_period=write_period, action_period=action_period)
+            )
+        finally:
+            self._running = False
+            self._flush_recorder()
+
+    async def _run_async(self, *, write_period: float, action_period: float) -> None:
+        import asyncio
+
+        await asyncio.gather(
+            self._sense_continuously(),
+            self._every(action_period, self._act),
+            self._every(write_period, self._write_latest),
+        )
+
+    async def _every(self, period: float, step) -> None:
+        import asyncio
+
+        while self._running:
+            step()
+            await asyncio.sleep(period)
+
+    async def _sense_continuously(self) -> None:
+        import asyncio
+
+        while self._running:
+            self._sense()
+            self._finish_instruments()
+            for delay in self._waits():
+                await asyncio.sleep(delay)
+
+    def _start_stage(self) -> None:
+        for instrument in self._instruments:
+            instrument.start()
+
+    def _mark(self, stage: int) -> None:
+        for instrument in self._instruments:
+            instrument.mark(stage)
+
+    def _finish_instruments(self) -> None:
+        if self._console is None:
+            return
+
+        keys = self._console.read()
+        for instrument in self._instruments:
+            instrument.finish(keys)
+
+    def _sample(self) -> float | None:
+        self._start_stage()
+        distance = self.distance_sensor.distance
+        self._mark(Stage.RANGING)
+        if self.recorder is not None:
+            self.recorder.record_sample(distance)
+
+        if distance is not None:
+            state = self.monitor.state
+            is_in_range = self.min_distance_cm <= distance <= self.max_distance_cm
+            # The time slept since the monitor was last updated
+            self.monitor.update(is_in_range, elapsed=self._unaccounted)
+            if self.recorder is not None and self.monitor.state != state:
+                self.recorder.record_state(STATES.index(self.monitor.state))
+        self._mark(Stage.MONITOR)
+        return distance
+
+    def _sense(self) -> None:
+        self._distance = self._sample()
+        self._period = self._next_period()
+
+    def _waits(self):
+        # Yields the sleeps until the next sample, stopping at each timer
+        # deadline on the way so alerts and resets fire on time, and at each
+        # step of a deferred display initialisation so it is not held back a
+        # whole period per step
+        remaining = self._period
         while True:
-            if (distance := self.distance_sensor.distance) is not None:
-                is_in_range = self.min_distance_cm <= distance <= self.max_distance_cm
-                self.monitor.update(is_in_range)
-
-            self._action_handlers[self.monitor.state]()
-            self._write_data(distance)
-
-    def _write_data(self, distance: float) -> None:
-        data = {
-            "distance": distance or 0,
-            "state": self.monitor.state,
-            "time_to_alert": self.monitor.time_to_alert,
-            "time_to_reset": self.monitor.time_to_reset,
-        }
-        for writer in self._writers:
-            writer.function(writer.formatter(data))
+            deadline = self.monitor.next_deadline()
+            display_due = self._display_due()
+            for_display = display_due is not None and (
+                deadline is None or display_due < deadline
+            )
+            if for_display:
+                deadline = display_due
+            if deadline is None or deadline >= remaining:
+                break
+
+            # Whole milliseconds, so a measuring clock sees the deadline pass;
+            # rounding first keeps float noise from adding one
+            step = math.ceil(round(deadline * 1000, 3)) / 1000
+            yield step
+            remaining -= step
+            state = self.monitor.state
+            self.monitor.advance(step)
+            if self.monitor.state != state:
+                if self.recorder is not None:
+                    self.recorder.record_state(STATES.index(self.monitor.state))
+                if self.snapshots is not None:
+                    # Dual-core mode: outputs belong to the other core
+                    self.snapshots.publish(self._produced, self.monitor)
+                else:
+                    self._act()
+                    self._write_latest()
+            elif for_display:
+                self._write_latest()
+            else:
+                break
+        self._unaccounted = max(0, remaining)
+        yield self._unaccounted
+
+    def _display_due(self) -> float | None:
+        if self.snapshots is not None:
+            # Dual-core mode: the other core polls the display
+            return None
+        due_ms = self.display.poll_due_ms()
+        return None if due_ms is None else due_ms / 1000
+
+    def _next_period(self) -> float:
+        if self.sampling_policy is None:
+            return self.monitor.resolution
+        return self.sampling_policy.period(self.monitor.state)
+
+    def _act(self) -> None:
+        self._start_stage()
+        self._action_handlers[self._status.state]()
+        self._mark(Stage.ACTION)
+
+    def _write_latest(self) -> None:
+        # Advances a deferred display initialisation between frames
+        self.display.poll()
+        self._write_data(self._distance)
+
+    def _write_data(self, distance: float | None) -> None:
+        data = self._data
+        data["distance"] = distance or 0
+        status = self._status
+        data["state"] = status.state
+        data["time_to_alert"] = status.time_to_alert
+        data["time_to_reset"] = status.time_to_reset
+        for index in range(len(self.writers)):
+            self._start_stage()
+            self.writers[index].write(data)
+            self._mark(Stage.WRITER + index)
 
     def _action_idle(self):
         self.led.on()
-        self.buzzer.off()
-        time.sleep(self.resolution)
+        self.sequencer.stop()
 
     def _action_detected(self):
-        if self.monitor.elapsed_time >= self.resolution * 2:
+        if self._status.elapsed_time >= self.resolution * 2:
             # At least two consecutive detections
-            self.led.flash_detected(self.resolution)
+            self.led.flash_detected()
         else:
-            time.sleep(self.resolution)
-        self.buzzer.off()
+            self.led.on()
+        self.sequencer.stop()
 
     def _action_occluded(self):
-        self.led.flash_occluded(self.resolution)
-        self.buzzer.off()
+        self.led.flash_occluded()
+        self.sequencer.stop()
 
     def _action_alarm(self):
-        self.led.flash_alarm(self.resolution)
-        self.buzzer.on()
+        self.led.flash_alarm()
+        # Keeps playing across calls, and on through ARMED until the reset
+        self.sequencer.play(self.alarm_pattern, repeat=0)
 
     def _action_armed(self):
-        self.led.flash_armed(self.resolution)
+        # The target is only out of sight, so the alarm keeps sounding
+        self.led.flash_armed()
 
     @property
     def resolution(self) -> float:
-        return self.monitor.resolution
+        return self._period
@@ -2,6 +2,18 @@ from states import Event, State, create_state_machine
 
 from lib import StateMachine
 
+try:
+    from typing import TYPE_CHECKING
+except ImportError:
+    # MicroPython has no typing module
+    TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from lib import SensorGroup
+
+_TRACKED_STATES = (State.DETECTED, State.ALARM)
+_OCCLUDED_STATES = (State.OCCLUDED, State.ARMED)
+
 
 class LoiteringMonitor:
     def __init__(
@@ -10,46 +22,104 @@ class LoiteringMonitor:
         timeout_seconds: int = 30,
         leeway_seconds: int = 5,
         resolution: float = 0.5,
-        fsm: StateMachine = create_state_machine(),
+        fsm: StateMachine | None = None,
+        clock=None,
     ):
         self.alert_after_seconds = alert_after_seconds
         self.timeout_seconds = timeout_seconds
         self.leeway_seconds = leeway_seconds
         self.resolution = resolution
-        self._fsm = fsm
+        # A default instance would be shared between monitors
+        self._fsm = create_state_machine() if fsm is None else fsm
+        # Events are resolved to ids once, so a compiled machine does no
+        # dictionary lookups per update
+        if hasattr(self._fsm, "transition_id"):
+            self._transition = self._fsm.transition_id
+            event_of = self._fsm.event_id_of
+        else:
+            self._transition = self._fsm.transition
+            event_of = str
+        self._in_range = event_of(Event.TARGET_IN_RANGE)
+        self._out_of_range = event_of(Event.TARGET_OUT_OF_RANGE)
+        self._alert_time_reached = event_of(Event.ALERT_TIME_REACHED)
+        self._occlusion_timeout = event_of(Event.OCCLUSION_TIMEOUT)
+
+        # Any object with MicroPython-style ticks_ms() and ticks_diff(), such
+        # as the time module. Without one, every update counts as resolution.
+        self._clock = clock
+        self._last_update_ms: int | None = None
+        self.drift = 0.0
+        self.max_drift = 0.0
 
         self._elapsed_time = 0
         self._occluded_time = 0
 
-    def update(self, is_in_range: bool) -> None:
-        self._update_times()
+    def update(self, is_in_range: bool, elapsed: float | None = None) -> None:
+        self._update_times(self.resolution if elapsed is None else elapsed)
 
         if is_in_range:
-            self._fsm.transition(Event.TARGET_IN_RANGE)
+            self._transition(self._in_range)
         else:
-            self._fsm.transition(Event.TARGET_OUT_OF_RANGE)
+            self._transition(self._out_of_range)
+        self._check_timers()
+
+    def advance(self, elapsed: float | None = None) -> None:
+        # Lets time pass without a reading, firing only the timer events
+        self._update_times(self.resolution if elapsed is None else elapsed)
+        self._check_timers()
+
+    def next_deadline(self) -> float | None:
+        # Seconds until a timer event fires if nothing new is seen, or None
+        # when only a reading can change the state
+        state = self._fsm.state
+        if state == State.DETECTED:
+            return max(0, self.alert_after_seconds - self._elapsed_time)
+        if state in _OCCLUDED_STATES:
+            return max(0, self.timeout_seconds - self._occluded_time)
+        return None
 
+    def _check_timers(self) -> None:
         if self._elapsed_time >= self.alert_after_seconds:
-            self._fsm.transition(Event.ALERT_TIME_REACHED)
+            self._transition(self._alert_time_reached)
 
         if (
             self._occluded_time >= self.timeout_seconds
             or self._elapsed_time < self.leeway_seconds
         ):
-            self._fsm.transition(Event.OCCLUSION_TIMEOUT)
+            self._transition(self._occlusion_timeout)
+
+    def _update_times(self, period: float) -> None:
+        step = self._step(period)
 
-    def _update_times(self) -> None:
-        if self.state == State.IDLE:
+        # Read once; the machine's state is a property
+        state = self._fsm.state
+        if state == State.IDLE:
             self._elapsed_time = 0
             self._occluded_time = 0
             return
 
-        self._elapsed_time += self.resolution
+        # Whole milliseconds, as the clock measures them, so the sums reach
+        # the thresholds exactly rather than a rounding error short
+        self._elapsed_time = round(self._elapsed_time + step, 3)
 
-        if self.state in [State.DETECTED, State.ALARM]:
+        if state in _TRACKED_STATES:
             self._occluded_time = 0
-        elif self.state in [State.OCCLUDED, State.ARMED]:
-            self._occluded_time += self.resolution
+        elif state in _OCCLUDED_STATES:
+            self._occluded_time = round(self._occluded_time + step, 3)
+
+    def _step(self, period: float) -> float:
+        if self._clock is None:
+            return period
+
+        now = self._clock.ticks_ms()
+        last, self._last_update_ms = self._last_update_ms, now
+        if last is None:
+            return period
+
+        step = self._clock.ticks_diff(now, last) / 1000
+        self.drift = step - period
+        self.max_drift = max(self.max_drift, self.drift)
+        return step
 
     @property
     def state(self) -> str:
@@ -69,6 +139,94 @@ class LoiteringMonitor:
 
     @property
     def time_to_reset(self) -> float:
-        if self._fsm.state in [State.OCCLUDED, State.ARMED]:
+        if self._fsm.state in _OCCLUDED_STATES:
             return max(0, self.timeout_seconds - self._occluded_time)
         return float(self.timeout_seconds)
+
+
+class MultiZoneMonitor:
+    # Highest first; the zone in the most urgent state drives the outputs
+    STATE_PRIORITY = [
+        State.ALARM,
+        State.ARMED,
+        State.DETECTED,
+        State.OCCLUDED,
+        State.IDLE,
+    ]
+
+    def __init__(self, sensors: "SensorGroup", monitors: list[LoiteringMonitor]):
+        if len(sensors.sensors) != len(monitors):
+            raise ValueError("Each sensor needs exactly one monitor")
+
+        self.sensors = sensors
+        self.monitors = monitors
+        self._pending_time = [0.0] * len(monitors)
+
+        # Every zone is visited once per round, so sample as often as the
+        # zones need in total, but no faster than crosstalk allows.
+        self.resolution = max(
+            sensors.min_interval_us / 1_000_000,
+            min(monitor.resolution for monitor in monitors) / len(monitors),
+        )
+
+    def update(self, is_in_range: bool, elapsed: float | None = None) -> None:
+        if elapsed is None:
+            elapsed = self.resolution
+        for index in range(len(self._pending_time)):
+            self._pending_time[index] += elapsed
+
+        index = self.sensors.index
+        self.monitors[index].update(is_in_range, elapsed=self._pending_time[index])
+        self._pending_time[index] = 0
+
+    def advance(self, elapsed: float | None = None) -> None:
+        if elapsed is None:
+            elapsed = self.resolution
+        for index, monitor in enumerate(self.monitors):
+            monitor.advance(self._pending_time[index] + elapsed)
+            self._pending_time[index] = 0
+
+    def next_deadline(self) -> float | None:
+        deadline = None
+        for index, monitor in enumerate(self.monitors):
+            zone_deadline = monitor.next_deadline()
+            if zone_deadline is None:
+                continue
+            # Time a zone has not been told about yet counts towards it
+            zone_deadline = max(0, zone_deadline - self._pending_time[index])
+            if deadline is None or zone_deadline < deadline:
+                deadline = zone_deadline
+        return deadline
+
+    @property
+    def zone(self) -> LoiteringMonitor:
+        zone = self.monitors[0]
+        for monitor in self.monitors[1:]:
+            priority = self.STATE_PRIORITY.index(monitor.state)
+            leading_priority = self.STATE_PRIORITY.index(zone.state)
+            if priority < leading_priority or (
+                priority == leading_priority
+                and monitor.elapsed_time > zone.elapsed_time
+            ):
+                zone = monitor
+        return zone
+
+    @property
+    def state(self) -> str:
+        return self.zone.state
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.zone.elapsed_time
+
+    @property
+    def occluded_time(self) -> float:
+        return self.zone.occluded_time
+
+    @property
+    def time_to_alert(self) -> float:
+        return self.zone.time_to_alert
+
+    @property
+    def time_to_reset(self) -> float:
+        return self.zone.time_to_reset
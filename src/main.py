@@ -34,7 +34,7 @@ def build_loitering_alarm(*, distance_sensor, display, buzzer, monitor, debug=Fa
 
 if __name__ == "__main__":
     distance_sensor = HC_SR04(trigger_pin=14, echo_pin=15)
-    display = AE_AQM0802(clock_pin=17, data_pin=16)
+    display = AE_AQM0802(clock_pin=17, data_pin=16, defer_init=True)
     buzzer = Buzzer(pin_number=13, is_active=False)
     monitor = LoiteringMonitor(
         alert_after_seconds=5 * 60,
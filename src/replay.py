@@ -0,0 +1,24 @@
+from loitering_monitor import LoiteringMonitor
+
+from lib import TraceReplay
+
+
+def replay(
+    source: TraceReplay,
+    monitor: LoiteringMonitor,
+    *,
+    min_distance_cm: float = 60,
+    max_distance_cm: float = 120,
+) -> list[tuple[int, str]]:
+    # Pass the source as the monitor's clock to reproduce the recorded timing
+    transitions = [(source.ticks_ms(), monitor.state)]
+    while True:
+        try:
+            distance = source.distance
+        except EOFError:
+            return transitions
+
+        if distance is not None:
+            monitor.update(min_distance_cm <= distance <= max_distance_cm)
+        if monitor.state != transitions[-1][1]:
+            transitions.append((source.ticks_ms(), monitor.state))
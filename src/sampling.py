@@ -0,0 +1,15 @@
+from states import State
+
+
+class SamplingPolicy:
+    def __init__(self, idle_period: float = 2.0, active_period: float = 0.5):
+        if idle_period <= 0 or active_period <= 0:
+            raise ValueError("Sampling periods must be positive")
+
+        self.idle_period = idle_period
+        self.active_period = active_period
+
+    def period(self, state: str) -> float:
+        if state == State.IDLE:
+            return self.idle_period
+        return self.active_period
@@ -0,0 +1,14 @@
+class Stage:
+    RANGING = 0
+    MONITOR = 1
+    ACTION = 2
+    # Writers are numbered from here in LoiteringAlarm.writers order
+    WRITER = 3
+
+    NAMES = ("ranging", "monitor", "action")
+
+    @classmethod
+    def name(cls, stage: int) -> str:
+        if stage < cls.WRITER:
+            return cls.NAMES[stage]
+        return f"writer {stage - cls.WRITER}"
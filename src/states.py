@@ -1,4 +1,4 @@
-from lib import StateMachine
+from lib import CompiledStateMachine, StateMachine
 
 
 class State:
@@ -9,6 +9,16 @@ class State:
     OCCLUDED = "occluded"
 
 
+# Stable integer ids, used by the compiled state machine and recordings
+STATES = (
+    State.IDLE,
+    State.DETECTED,
+    State.ALARM,
+    State.ARMED,
+    State.OCCLUDED,
+)
+
+
 class Event:
     TARGET_IN_RANGE = "target in range"
     TARGET_OUT_OF_RANGE = "target out of range"
@@ -16,6 +26,14 @@ class Event:
     OCCLUSION_TIMEOUT = "occlusion timeout"
 
 
+EVENTS = (
+    Event.TARGET_IN_RANGE,
+    Event.TARGET_OUT_OF_RANGE,
+    Event.ALERT_TIME_REACHED,
+    Event.OCCLUSION_TIMEOUT,
+)
+
+
 TRANSITIONS = {
     State.IDLE: {
         Event.TARGET_IN_RANGE: State.DETECTED,
@@ -44,7 +62,9 @@ def create_state_machine(
     if transitions is None:
         transitions = TRANSITIONS
 
-    return StateMachine(
+    return CompiledStateMachine(
         initial_state=State.IDLE,
         transitions=transitions,
+        states=STATES,
+        events=EVENTS,
     )
@@ -0,0 +1,104 @@
+import select
+import struct
+import sys
+from array import array
+
+from states import STATES
+
+# Layout shared with host/telemetry.py:
+# sync (2), sequence, state id, flags, distance in mm, time to alert in ms,
+# time to reset in ms, CRC-16/CCITT-FALSE over everything after the sync.
+FRAME_FORMAT = "<BBHBBHIIH"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+SYNC = (0xA5, 0x5A)
+FLAG_HAS_DISTANCE = 0x01
+
+_CRC_TABLE = array("H", [0] * 256)
+for _byte in range(256):
+    _crc = _byte << 8
+    for _ in range(8):
+        _crc = ((_crc << 1) ^ 0x1021 if _crc & 0x8000 else _crc << 1) & 0xFFFF
+    _CRC_TABLE[_byte] = _crc
+
+_STATE_IDS = {state: index for index, state in enumerate(STATES)}
+
+
+def crc16(data, start: int = 0, end: int | None = None) -> int:
+    crc = 0xFFFF
+    for index in range(start, len(data) if end is None else end):
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC_TABLE[(crc >> 8) ^ data[index]]
+    return crc
+
+
+class FrameFormatter:
+    def __init__(self) -> None:
+        self._buffer = bytearray(FRAME_SIZE)
+        self.sequence = 0
+
+    def __call__(self, data: dict) -> bytearray:
+        distance = data["distance"]
+        struct.pack_into(
+            FRAME_FORMAT,
+            self._buffer,
+            0,
+            SYNC[0],
+            SYNC[1],
+            self.sequence,
+            _STATE_IDS[data["state"]],
+            FLAG_HAS_DISTANCE if distance else 0,
+            min(int(distance * 10), 0xFFFF),
+            int(data["time_to_alert"] * 1000),
+            int(data["time_to_reset"] * 1000),
+            0,
+        )
+        struct.pack_into(
+            "<H", self._buffer, FRAME_SIZE - 2, crc16(self._buffer, 2, FRAME_SIZE - 2)
+        )
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        return self._buffer
+
+
+class FrameRing:
+    def __init__(self, capacity: int = 16, stream=None) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._buffer = bytearray(capacity * FRAME_SIZE)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._head = 0
+        self._count = 0
+
+        self._stream = sys.stdout.buffer if stream is None else stream
+        self._poll = select.poll()
+        self._poll.register(sys.stdout if stream is None else stream, select.POLLOUT)
+
+        self.sent = 0
+        self.dropped = 0
+
+    def write(self, frame: bytes) -> None:
+        self.push(frame)
+        self.drain()
+
+    def push(self, frame: bytes) -> bool:
+        if self._count == self._capacity:
+            # Drop the newest frame; queued ones are already in order
+            self.dropped += 1
+            return False
+
+        offset = ((self._head + self._count) % self._capacity) * FRAME_SIZE
+        self._buffer[offset : offset + FRAME_SIZE] = frame
+        self._count += 1
+        return True
+
+    def drain(self) -> None:
+        # Only write while the host is reading, so USB-CDC never blocks us
+        while self._count and self._poll.poll(0):
+            offset = self._head * FRAME_SIZE
+            self._stream.write(self._view[offset : offset + FRAME_SIZE])
+            self._head = (self._head + 1) % self._capacity
+            self._count -= 1
+            self.sent += 1
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,27 +1,173 @@
+import sys
+import time
 from ucollections import namedtuple
 
+from states import STATES
+
 Writer = namedtuple("Writer", ["function", "formatter"])
 
+_ZERO = ord("0")
+_SPACE = ord(" ")
+
+# Fixed-width labels so rendering never builds strings
+_SERIAL_STATE_WIDTH = max(len(state) for state in STATES)
+_SERIAL_STATE_LABELS = {
+    state: (state + " " * (_SERIAL_STATE_WIDTH - len(state))).encode()
+    for state in STATES
+}
+_LCD_STATE_LABELS = {state: state[:2].upper().encode() for state in STATES}
+
+
+def _put_int(buffer: bytearray, offset: int, value: int, width: int, fill: int) -> None:
+    # Right-aligned; digits beyond `width` are dropped, so callers clamp
+    for index in range(offset + width - 1, offset - 1, -1):
+        if value or index == offset + width - 1:
+            buffer[index] = _ZERO + value % 10
+            value //= 10
+        else:
+            buffer[index] = fill
+
+
+def _put_bytes(buffer: bytearray, offset: int, data: bytes) -> None:
+    for index in range(len(data)):
+        buffer[offset + index] = data[index]
+
+
+def _put_time(buffer: bytearray, offset: int, seconds: float) -> None:
+    # MM:SS, truncated to whole seconds
+    seconds = min(int(seconds), 99 * 60 + 59)
+    _put_int(buffer, offset, seconds // 60, 2, _ZERO)
+    _put_int(buffer, offset + 3, seconds % 60, 2, _ZERO)
+
+
+def _put_distance(buffer: bytearray, offset: int, distance: float) -> None:
+    # ddd.d, space padded; round() boxes one float where adding 0.5 boxed two
+    tenths = min(round(distance * 10), 9999)
+    _put_int(buffer, offset, tenths // 10, 3, _SPACE)
+    buffer[offset + 4] = _ZERO + tenths % 10
+
+
+class _Template:
+    def __init__(self, *parts: bytes | int) -> None:
+        # Literal byte strings interleaved with field widths
+        self.offsets = []
+        template = bytearray()
+        for part in parts:
+            if isinstance(part, int):
+                self.offsets.append(len(template))
+                template.extend(b" " * part)
+            else:
+                template.extend(part)
+        self.buffer = template
+
+
+class SerialFormatter:
+    def __init__(self) -> None:
+        self._template = _Template(
+            b"Distance: ",
+            5,
+            b" cm\nState: ",
+            _SERIAL_STATE_WIDTH,
+            b"\nTime to alert: ",
+            5,
+            b"\nTime to reset: ",
+            5,
+            b"\n",
+        )
+        self._template.buffer[self._template.offsets[0] + 3] = ord(".")
+        self._template.buffer[self._template.offsets[2] + 2] = ord(":")
+        self._template.buffer[self._template.offsets[3] + 2] = ord(":")
+
+    def __call__(self, data: dict) -> bytearray:
+        buffer = self._template.buffer
+        distance, state, alert, reset = self._template.offsets
+        _put_distance(buffer, distance, data["distance"])
+        _put_bytes(buffer, state, _SERIAL_STATE_LABELS[data["state"]])
+        _put_time(buffer, alert, data["time_to_alert"])
+        _put_time(buffer, reset, data["time_to_reset"])
+        return buffer
+
+
+class LCDFormatter:
+    def __init__(self) -> None:
+        self._template = _Template(5, b" ", 2, b"\n", 5, b" ", 2)
+        self._template.buffer[self._template.offsets[0] + 3] = ord(".")
+        self._template.buffer[self._template.offsets[2] + 2] = ord(":")
+
+    def __call__(self, data: dict) -> bytearray:
+        buffer = self._template.buffer
+        distance, state, alert, reset = self._template.offsets
+        _put_distance(buffer, distance, data["distance"])
+        _put_bytes(buffer, state, _LCD_STATE_LABELS[data["state"]])
+        _put_time(buffer, alert, data["time_to_alert"])
+        _put_int(buffer, reset, min(round(data["time_to_reset"]), 99), 2, _ZERO)
+        return buffer
+
+
+class WriterPolicy:
+    def __init__(
+        self,
+        writer: Writer,
+        *,
+        skip_unchanged: bool = False,
+        max_rate_hz: float | None = None,
+        refresh_on_state_change: bool = True,
+    ) -> None:
+        if max_rate_hz is not None and max_rate_hz <= 0:
+            raise ValueError("max_rate_hz must be positive")
+
+        self.writer = writer
+        self.skip_unchanged = skip_unchanged
+        self.min_interval_ms = 0 if max_rate_hz is None else int(1000 / max_rate_hz)
+        self.refresh_on_state_change = refresh_on_state_change
+
+        self.emitted = 0
+        self.suppressed = 0
+
+        self._last_output: str | bytearray | None = None
+        self._last_state: str | None = None
+        self._last_emit_ms: int | None = None
+
+    def write(self, data: dict) -> bool:
+        now = time.ticks_ms()
+        forced = self.refresh_on_state_change and data["state"] != self._last_state
+
+        if (
+            not forced
+            and self._last_emit_ms is not None
+            and time.ticks_diff(now, self._last_emit_ms) < self.min_interval_ms
+        ):
+            # Checked before formatting so throttled frames cost nothing
+            self.suppressed += 1
+            return False
+
+        output = self.writer.formatter(data)
+        if not forced and self.skip_unchanged and output == self._last_output:
+            self.suppressed += 1
+            return False
 
-def _format_time(seconds: float) -> str:
-    minutes, seconds = divmod(seconds, 60)
-    return f"{int(minutes):02}:{int(seconds):02}"
+        self.writer.function(output)
+        self.emitted += 1
+        self._last_state = data["state"]
+        self._last_emit_ms = now
+        self._remember(output)
+        return True
 
+    def _remember(self, output: str | bytearray) -> None:
+        if isinstance(output, str):
+            self._last_output = output
+        elif self._last_output is None or isinstance(self._last_output, str):
+            self._last_output = bytearray(output)
+        else:
+            # Formatters reuse their buffer, so keep a copy of its contents
+            self._last_output[:] = output
 
-def serial_formatter(data: dict) -> str:
-    return (
-        f"Distance: {data['distance']:.1f} cm\n"
-        f"State: {data['state']}\n"
-        f"Time to alert: {_format_time(data['time_to_alert'])}\n"
-        f"Time to reset: {_format_time(data['time_to_reset'])}"
-    )
 
+def _write_stdout(buffer: bytearray) -> None:
+    sys.stdout.buffer.write(buffer)
 
-def lcd_formatter(data: dict) -> str:
-    return (
-        f"{data['distance']:5.1f} {data['state'][:2].upper()}\n"
-        f"{_format_time(data['time_to_alert'])} {data['time_to_reset']:02.0f}"
-    )
 
+serial_formatter = SerialFormatter()
+lcd_formatter = LCDFormatter()
 
-serial_writer = Writer(print, serial_formatter)
+serial_writer = Writer(_write_stdout, serial_formatter)